@@ -0,0 +1,157 @@
+"""
+Wearable AI Companion - Audio Uplink Codecs
+Handles:
+- Negotiating the uplink encoding for `audio` messages
+- NumPy-vectorized G.711 µ-law and IMA-ADPCM decoding to 16-bit PCM
+
+IMA-ADPCM frames are self-contained so a lost frame never corrupts the
+next one: a 4-byte header (int16 predictor, uint8 step index, uint8
+reserved) followed by 4-bit codes, low nibble first. The header state is
+the decoder state *before* the first code and is not itself emitted.
+"""
+
+from typing import Iterable, Optional
+
+import numpy as np
+
+CODEC_PCM16 = "pcm16"
+CODEC_MULAW = "mulaw"
+CODEC_IMA_ADPCM = "ima_adpcm"
+
+# Server preference order, best compression first
+SUPPORTED_CODECS = (CODEC_IMA_ADPCM, CODEC_MULAW, CODEC_PCM16)
+
+# Encoded bits per 16-bit sample, for bandwidth reporting
+BITS_PER_SAMPLE = {CODEC_PCM16: 16, CODEC_MULAW: 8, CODEC_IMA_ADPCM: 4}
+
+
+def _mulaw_table() -> np.ndarray:
+    u = ~np.arange(256, dtype=np.int32) & 0xFF
+    exponent = (u >> 4) & 0x07
+    mantissa = u & 0x0F
+    magnitude = (((mantissa << 3) + 0x84) << exponent) - 0x84
+    return np.where(u & 0x80, -magnitude, magnitude).astype("<i2")
+
+
+MULAW_TABLE = _mulaw_table()
+
+IMA_INDEX_TABLE = np.array([-1, -1, -1, -1, 2, 4, 6, 8] * 2, dtype=np.int64)
+IMA_STEP_TABLE = np.array([
+    7, 8, 9, 10, 11, 12, 13, 14, 16, 17, 19, 21, 23, 25, 28, 31, 34, 37, 41, 45,
+    50, 55, 60, 66, 73, 80, 88, 97, 107, 118, 130, 143, 157, 173, 190, 209, 230,
+    253, 279, 307, 337, 371, 408, 449, 494, 544, 598, 658, 724, 796, 876, 963,
+    1060, 1166, 1282, 1411, 1552, 1707, 1878, 2066, 2272, 2499, 2749, 3024, 3327,
+    3660, 4026, 4428, 4871, 5358, 5894, 6484, 7132, 7845, 8630, 9493, 10442,
+    11487, 12635, 13899, 15289, 16818, 18500, 20350, 22385, 24623, 27086, 29794,
+    32767,
+], dtype=np.int64)
+IMA_HEADER_SIZE = 4
+
+
+def _ima_diff_table() -> np.ndarray:
+    """Magnitude decoded for every (step index, 3-bit code) pair"""
+    step = IMA_STEP_TABLE[:, None]
+    code = np.arange(8)[None, :]
+    return ((step >> 3) + np.where(code & 4, step, 0)
+            + np.where(code & 2, step >> 1, 0) + np.where(code & 1, step >> 2, 0))
+
+
+IMA_DIFF_TABLE = _ima_diff_table()
+
+
+def negotiate(offered: Optional[Iterable[str]]) -> str:
+    """Pick the best codec both sides support (PCM if none offered)"""
+    offered = set(offered or ())
+    for codec in SUPPORTED_CODECS:
+        if codec in offered:
+            return codec
+    return CODEC_PCM16
+
+
+def decode_mulaw(payload: bytes) -> np.ndarray:
+    """G.711 µ-law bytes -> int16 samples via one table lookup"""
+    return MULAW_TABLE[np.frombuffer(payload, dtype=np.uint8)]
+
+
+# Ceiling hits handled by restarting the fast path before falling back to the scan
+MAX_CEILING_RESTARTS = 8
+
+
+def _clamp_scan(deltas: np.ndarray, start: int, lo: int, hi: int) -> np.ndarray:
+    """x[i] = clip(x[i-1] + deltas[i], lo, hi) as a parallel prefix scan.
+
+    Each step is the map x -> clip(x + a, l, h); such maps are closed under
+    composition, so a Hillis-Steele scan over (a, l, h) triples gives every
+    prefix in O(log n) vectorized passes whatever the input.
+    """
+    a = deltas.copy()
+    l = np.full(a.shape, lo, dtype=np.int64)
+    h = np.full(a.shape, hi, dtype=np.int64)
+    shift = 1
+    while shift < a.size:
+        # Compose step i with the prefix ending at i - shift (applied first)
+        a2, l2, h2 = a[shift:], l[shift:], h[shift:]
+        a1, l1, h1 = a[:-shift], l[:-shift], h[:-shift]
+        a = np.concatenate((a[:shift], a1 + a2))
+        l = np.concatenate((l[:shift], np.clip(l1 + a2, l2, h2)))
+        h = np.concatenate((h[:shift], np.clip(h1 + a2, l2, h2)))
+        shift *= 2
+    return np.clip(start + a, l, h)
+
+
+def _clamped_cumsum(deltas: np.ndarray, start: int, lo: int, hi: int) -> np.ndarray:
+    """x[i] = clip(x[i-1] + deltas[i], lo, hi) without a per-sample loop.
+
+    Fast path: a running sum reflected off the floor (Skorokhod map) is
+    exact until the first ceiling hit, where it restarts. Signals that keep
+    hitting the ceiling fall back to the prefix scan.
+    """
+    deltas = deltas.astype(np.int64)
+    out = np.empty_like(deltas)
+    pos, value = 0, start
+    for _ in range(MAX_CEILING_RESTARTS):
+        run = value + np.cumsum(deltas[pos:])
+        run += np.maximum(np.maximum.accumulate(lo - run), 0)
+        over = np.flatnonzero(run > hi)
+        if over.size == 0:
+            out[pos:] = run
+            return out
+        k = over[0]
+        out[pos:pos + k] = run[:k]
+        out[pos + k] = hi
+        pos, value = pos + k + 1, hi
+        if pos == deltas.size:
+            return out
+    out[pos:] = _clamp_scan(deltas[pos:], value, lo, hi)
+    return out
+
+
+def decode_ima_adpcm(payload: bytes) -> np.ndarray:
+    """One self-contained IMA-ADPCM frame -> int16 samples"""
+    if len(payload) <= IMA_HEADER_SIZE:
+        return np.zeros(0, dtype="<i2")
+    predictor = int(np.frombuffer(payload[:2], dtype="<i2")[0])
+    index = min(max(payload[2], 0), 88)
+
+    packed = np.frombuffer(payload, dtype=np.uint8, offset=IMA_HEADER_SIZE)
+    codes = np.empty(packed.size * 2, dtype=np.int64)
+    codes[0::2] = packed & 0x0F
+    codes[1::2] = packed >> 4
+
+    # Step index after each code, then the index each code was decoded with
+    index_after = _clamped_cumsum(IMA_INDEX_TABLE[codes], index, 0, 88)
+    index_before = np.concatenate(([index], index_after[:-1]))
+
+    diff = IMA_DIFF_TABLE[index_before, codes & 7]
+    diff = np.where(codes & 8, -diff, diff)
+
+    return _clamped_cumsum(diff, predictor, -32768, 32767).astype("<i2")
+
+
+def decode_audio(codec: str, payload: bytes) -> bytes:
+    """Decode one uplink frame to 16-bit little-endian PCM"""
+    if codec == CODEC_MULAW:
+        return decode_mulaw(payload).tobytes()
+    if codec == CODEC_IMA_ADPCM:
+        return decode_ima_adpcm(payload).tobytes()
+    return payload
@@ -0,0 +1,157 @@
+"""
+Benchmark: compressed audio uplink
+Decode throughput of the vectorized µ-law / IMA-ADPCM decoders (checked
+against a straightforward per-sample reference) and the uplink bandwidth
+of one device for each codec, including base64 + JSON framing.
+
+Run from the repo root:
+    python backend/benchmarks/bench_audio_codec.py [seconds_of_audio]
+"""
+
+import base64
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from audio_codec import (
+    BITS_PER_SAMPLE, CODEC_IMA_ADPCM, CODEC_MULAW, CODEC_PCM16,
+    IMA_INDEX_TABLE, IMA_STEP_TABLE, decode_audio,
+)
+
+SAMPLE_RATE = 16000
+FRAME_SAMPLES = 256       # one firmware audio chunk
+FRAMES_PER_MESSAGE = 2    # AUDIO_BATCH_FRAMES in the firmware
+
+
+# Reference encoders / decoder, same algorithms as the firmware, one sample at a time
+def encode_mulaw(samples: np.ndarray) -> bytes:
+    out = bytearray()
+    for s in samples.astype(int):
+        sign = 0x80 if s < 0 else 0
+        s = min(abs(s), 32635) + 0x84
+        exponent = 7
+        while exponent > 0 and not (s & (0x4000 >> (7 - exponent))):
+            exponent -= 1
+        mantissa = (s >> (exponent + 3)) & 0x0F
+        out.append(~(sign | (exponent << 4) | mantissa) & 0xFF)
+    return bytes(out)
+
+
+def encode_ima_adpcm(samples: np.ndarray, predictor: int = 0, index: int = 0) -> bytes:
+    header = int(predictor).to_bytes(2, "little", signed=True) + bytes([index, 0])
+    codes = []
+    for s in samples.astype(int):
+        step = int(IMA_STEP_TABLE[index])
+        diff = s - predictor
+        code = 8 if diff < 0 else 0
+        diff = abs(diff)
+        delta = step >> 3
+        if diff >= step:
+            code |= 4; diff -= step; delta += step
+        if diff >= step >> 1:
+            code |= 2; diff -= step >> 1; delta += step >> 1
+        if diff >= step >> 2:
+            code |= 1; delta += step >> 2
+        predictor = max(-32768, min(32767, predictor - delta if code & 8 else predictor + delta))
+        index = max(0, min(88, index + int(IMA_INDEX_TABLE[code])))
+        codes.append(code)
+    packed = bytes(codes[i] | (codes[i + 1] << 4) for i in range(0, len(codes), 2))
+    return header + packed
+
+
+def reference_decode_ima_adpcm(payload: bytes) -> np.ndarray:
+    predictor = int.from_bytes(payload[:2], "little", signed=True)
+    index = payload[2]
+    out = []
+    for byte in payload[4:]:
+        for code in (byte & 0x0F, byte >> 4):
+            step = int(IMA_STEP_TABLE[index])
+            diff = step >> 3
+            if code & 4: diff += step
+            if code & 2: diff += step >> 1
+            if code & 1: diff += step >> 2
+            predictor = max(-32768, min(32767, predictor - diff if code & 8 else predictor + diff))
+            index = max(0, min(88, index + int(IMA_INDEX_TABLE[code])))
+            out.append(predictor)
+    return np.array(out, dtype="<i2")
+
+
+def speechlike(seconds: float) -> np.ndarray:
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 3 * t)
+    tone = np.sin(2 * np.pi * 220 * t) + 0.5 * np.sin(2 * np.pi * 880 * t)
+    noise = np.random.default_rng(0).normal(0, 0.05, t.size)
+    return (12000 * envelope * tone / 1.5 + 3000 * noise).clip(-32768, 32767).astype(np.int16)
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    pcm = speechlike(seconds)
+    frames = [pcm[i:i + FRAME_SAMPLES] for i in range(0, pcm.size - FRAME_SAMPLES + 1, FRAME_SAMPLES)]
+
+    encoded = {
+        CODEC_PCM16: [f.astype("<i2").tobytes() for f in frames],
+        CODEC_MULAW: [encode_mulaw(f) for f in frames],
+        CODEC_IMA_ADPCM: [],
+    }
+    predictor, index = 0, 0
+    for f in frames:
+        payload = encode_ima_adpcm(f, predictor, index)
+        encoded[CODEC_IMA_ADPCM].append(payload)
+        decoded = reference_decode_ima_adpcm(payload)
+        predictor = int(decoded[-1])
+        # carry the step index forward like the firmware encoder does
+        index = payload[2]
+        for code in np.frombuffer(payload[4:], dtype=np.uint8):
+            for c in (code & 0x0F, code >> 4):
+                index = max(0, min(88, index + int(IMA_INDEX_TABLE[c])))
+
+    # Correctness against the per-sample reference
+    for payload in encoded[CODEC_IMA_ADPCM][:50]:
+        vectorized = np.frombuffer(decode_audio(CODEC_IMA_ADPCM, payload), dtype="<i2")
+        assert np.array_equal(vectorized, reference_decode_ima_adpcm(payload)), "ADPCM mismatch"
+
+    total_samples = len(frames) * FRAME_SAMPLES
+    print(f"{seconds:.0f}s of 16 kHz audio, {len(frames)} frames of {FRAME_SAMPLES} samples\n")
+    print(f"{'codec':<11}{'decode Msamples/s':>18}{'SNR dB':>8}"
+          f"{'payload kbit/s':>16}{'wire kbit/s':>13}{'vs pcm16':>10}")
+
+    baseline_wire = None
+    for codec in (CODEC_PCM16, CODEC_MULAW, CODEC_IMA_ADPCM):
+        payloads = encoded[codec]
+        start = time.perf_counter()
+        decoded = b"".join(decode_audio(codec, p) for p in payloads)
+        elapsed = time.perf_counter() - start
+        out = np.frombuffer(decoded, dtype="<i2").astype(np.float64)
+        ref = np.concatenate(frames).astype(np.float64)
+        noise = np.sum((out - ref) ** 2)
+        snr = 10 * np.log10(np.sum(ref ** 2) / noise) if noise else float("inf")
+
+        # Wire size of the actual JSON messages the firmware sends
+        wire = 0
+        for i in range(0, len(payloads), FRAMES_PER_MESSAGE):
+            chunk = payloads[i:i + FRAMES_PER_MESSAGE]
+            wire += len(json.dumps({
+                "type": "audio", "seq": i, "timestamp": 1701253800000, "codec": codec,
+                "chunks": [base64.b64encode(c).decode() for c in chunk],
+            }))
+        wire_kbps = wire * 8 / seconds / 1000
+        baseline_wire = baseline_wire or wire_kbps
+        payload_kbps = SAMPLE_RATE * BITS_PER_SAMPLE[codec] / 1000
+        print(f"{codec:<11}{total_samples / elapsed / 1e6:>18.1f}{snr:>8.1f}"
+              f"{payload_kbps:>16.0f}{wire_kbps:>13.0f}{wire_kbps / baseline_wire:>9.0%}")
+
+    start = time.perf_counter()
+    for payload in encoded[CODEC_IMA_ADPCM]:
+        reference_decode_ima_adpcm(payload)
+    elapsed = time.perf_counter() - start
+    print(f"\nper-sample Python IMA-ADPCM decoder: {total_samples / elapsed / 1e6:.1f} Msamples/s")
+
+
+if __name__ == "__main__":
+    main()
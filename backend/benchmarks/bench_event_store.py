@@ -0,0 +1,172 @@
+"""
+Benchmark: event history store
+Ingest cost of EventStore.record() (including amortized batch flushes)
+next to the gesture message hot path, and time-range query latency over a
+large history, checked against a brute-force scan of the same events.
+Then a client-id flood: open file descriptors and mapped segments must
+stay bounded however many ids record an event.
+
+Run from the repo root:
+    python backend/benchmarks/bench_event_store.py [events] [clients] [flood_clients]
+"""
+
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from event_store import EMOTIONS, EVENT_TYPES, GESTURES, EventStore
+
+
+def synthetic_events(n: int, clients: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    gestures = [g for g in GESTURES if g not in ("none", "other")]
+    emotions = [e for e in EMOTIONS if e not in ("none", "other")]
+    kinds = rng.choice(EVENT_TYPES, n, p=[0.7, 0.2, 0.1])
+    for i in range(n):
+        kind = str(kinds[i])
+        yield (
+            f"m5-{i % clients}",
+            kind,
+            str(rng.choice(gestures)) if kind == "gesture" else None,
+            float(rng.random()) if kind == "gesture" else None,
+            str(rng.choice(emotions)),
+            float(rng.gamma(2.0, 40.0)) if kind != "button" else None,
+        )
+
+
+def stored_timestamps(store: EventStore, client_id: str) -> np.ndarray:
+    """Committed timestamps read straight from the column files (no mapping)"""
+    store.query(client_id)
+    return np.concatenate([np.fromfile(f"{s.prefix}.timestamp", dtype="<f8", count=s.count)
+                           for s in store.clients[client_id].segments])
+
+
+def open_fds() -> int:
+    return len(os.listdir("/proc/self/fd")) if os.path.isdir("/proc/self/fd") else -1
+
+
+def client_flood(root: str, clients: int):
+    """One gesture each from many client ids, as an attacker could send"""
+    store = EventStore(root, max_clients=256, max_mapped=64)
+    store.load()
+    before = open_fds()
+    start = time.perf_counter()
+    for i in range(clients):
+        store.record(f"dev{i}", "gesture", "wave", 0.5, "happy", 10.0)
+        if i % 100 == 99:
+            store.flush()
+    store.flush()
+    elapsed = time.perf_counter() - start
+    peak = open_fds()
+    summary = store.query()
+    after_query = open_fds()
+    snapshot = store.snapshot()
+    print(f"flood: {clients} client ids in {elapsed:.2f}s, fds {before} -> {peak} "
+          f"(after all-client query {after_query}), {snapshot['clients']} histories in memory, "
+          f"{snapshot['mapped_segments']} segments mapped, {snapshot['dropped']} dropped, "
+          f"{summary['events']} events queryable")
+    store.stop()
+    print(f"flood: fds after stop {open_fds()}")
+
+
+def brute_force(events, timestamps, client_id, start, end):
+    counts, latencies = {}, []
+    for (cid, kind, gesture, _, _, latency), ts in zip(events, timestamps):
+        if cid == client_id and start <= ts <= end:
+            if gesture:
+                counts[gesture] = counts.get(gesture, 0) + 1
+            if kind == "gesture" and latency is not None:
+                latencies.append(np.float32(latency))
+    return counts, latencies
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    flood_clients = int(sys.argv[3]) if len(sys.argv) > 3 else 2000
+    events = list(synthetic_events(n, clients))
+
+    with tempfile.TemporaryDirectory() as root:
+        store = EventStore(root, segment_rows=1 << 16, batch_size=256)
+
+        start = time.perf_counter()
+        for event in events:
+            store.record(*event)
+        store.flush()
+        ingest_s = time.perf_counter() - start
+        print(f"ingest: {n} events, {ingest_s / n * 1e6:.2f} us/event "
+              f"({n / ingest_s:,.0f} events/s, flushes included)")
+
+        # The gesture hot path already parses and serializes JSON per event
+        message = json.dumps({"type": "gesture", "gesture": "wave", "intensity": 0.8,
+                              "timestamp": 123456})
+        response = {"type": "response", "gesture": "wave", "text": "Hi there!",
+                    "animation": "wave_back", "emotion": "happy", "timestamp": "2024-01-01T00:00:00"}
+        start = time.perf_counter()
+        for _ in range(100_000):
+            json.loads(message)
+            json.dumps(response)
+        hot_path_us = (time.perf_counter() - start) / 100_000 * 1e6
+        print(f"gesture message JSON round trip alone: {hot_path_us:.2f} us "
+              f"(record() adds {ingest_s / n * 1e6 / hot_path_us:.0%})")
+
+        disk = sum(os.path.getsize(os.path.join(d, f))
+                   for d, _, files in os.walk(root) for f in files if not f.endswith(".json"))
+        print(f"disk: {disk / n:.1f} bytes/event allocated, {store.snapshot()['segments']} segments")
+
+        # Reopen from disk so queries go through the memory maps
+        store.stop()
+        store = EventStore(root)
+        start = time.perf_counter()
+        store.load()
+        print(f"load index: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        timestamps_0 = stored_timestamps(store, "m5-0")
+        t0, t1 = timestamps_0[0], timestamps_0[-1]
+        windows = {
+            "all time, all clients": (None, None, None),
+            "all time, one client": ("m5-0", None, None),
+            "last 10%, one client": ("m5-0", t1 - (t1 - t0) * 0.1, None),
+            "middle 1%, one client": ("m5-0", t0 + (t1 - t0) * 0.5, t0 + (t1 - t0) * 0.51),
+        }
+        for label, (client_id, lo, hi) in windows.items():
+            store.query(client_id, lo, hi)
+            start = time.perf_counter()
+            for _ in range(20):
+                result = store.query(client_id, lo, hi)
+            elapsed = (time.perf_counter() - start) / 20 * 1000
+            print(f"query {label:24s} {elapsed:7.2f} ms  {result['events']:>8} events  "
+                  f"segments {result['segments_scanned']} scanned / {result['segments_skipped']} skipped")
+
+        # Correctness against a brute-force scan of one window
+        lo, hi = t0 + (t1 - t0) * 0.3, t0 + (t1 - t0) * 0.7
+        all_ts = []
+        per_client = {}
+        for cid, *_ in events:
+            per_client[cid] = per_client.get(cid, 0) + 1
+        offsets = {cid: 0 for cid in per_client}
+        columns = {cid: stored_timestamps(store, cid) for cid in per_client}
+        for cid, *_ in events:
+            all_ts.append(columns[cid][offsets[cid]])
+            offsets[cid] += 1
+        counts, latencies = brute_force(events, all_ts, "m5-0", lo, hi)
+        result = store.query("m5-0", lo, hi)
+        expected_p90 = round(float(np.percentile(latencies, 90)), 1) if latencies else None
+        got_p90 = result["latency_ms"].get("gesture", {}).get("p90")
+        ok = result["gestures"] == counts and (expected_p90 is None or math.isclose(got_p90, expected_p90))
+        print(f"matches brute force: {ok}")
+        store.stop()
+
+    with tempfile.TemporaryDirectory() as root:
+        client_flood(root, flood_clients)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: static frontend serving
+Compares the old StaticFiles mount against the in-memory precompressed
+cache for a kiosk refresh (index + app.js + avatar.js).
+
+Run from the repo root:
+    python backend/benchmarks/bench_static_assets.py [iterations]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from fastapi import FastAPI
+from fastapi.staticfiles import StaticFiles
+from fastapi.testclient import TestClient
+
+from main import app, Config, static_assets
+
+ASSETS = ["index.html", "js/app.js", "js/avatar.js"]
+
+
+def run(client, paths, headers, iterations):
+    """Return (requests/s, wire bytes per refresh, status codes)"""
+    wire_bytes = 0
+    statuses = set()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        wire_bytes = 0
+        for path in paths:
+            r = client.get(path, headers=headers)
+            statuses.add(r.status_code)
+            wire_bytes += int(r.headers.get("content-length", 0))
+    elapsed = time.perf_counter() - start
+    return iterations * len(paths) / elapsed, wire_bytes, sorted(statuses)
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    baseline_app = FastAPI()
+    baseline_app.mount("/static", StaticFiles(directory=Config.FRONTEND_DIR), name="static")
+    baseline = TestClient(baseline_app)
+    baseline_paths = [f"/static/{p}" for p in ASSETS]
+
+    cached = TestClient(app)
+    cached_paths = ["/"] + [f"/static/{static_assets.assets[p].fingerprinted_path}" for p in ASSETS[1:]]
+    etags = {}
+    for path in cached_paths:
+        etags[path] = cached.get(path, headers={"Accept-Encoding": "gzip, br"}).headers["etag"]
+
+    cases = [
+        ("StaticFiles (baseline)", baseline, baseline_paths, {"Accept-Encoding": "identity"}),
+        ("cache, identity", cached, cached_paths, {"Accept-Encoding": "identity"}),
+        ("cache, gzip", cached, cached_paths, {"Accept-Encoding": "gzip"}),
+        ("cache, br", cached, cached_paths, {"Accept-Encoding": "br, gzip"}),
+    ]
+
+    print(f"{'case':<26}{'req/s':>10}{'bytes/refresh':>16}  status")
+    for name, client, paths, headers in cases:
+        rps, wire, statuses = run(client, paths, headers, iterations)
+        print(f"{name:<26}{rps:>10.0f}{wire:>16}  {statuses}")
+
+    # Conditional refresh: every asset revalidated with its ETag
+    wire_total = 0
+    start = time.perf_counter()
+    for _ in range(iterations):
+        wire_total = 0
+        for path in cached_paths:
+            r = cached.get(path, headers={"Accept-Encoding": "gzip, br", "If-None-Match": etags[path]})
+            wire_total += int(r.headers.get("content-length", 0))
+    rps = iterations * len(cached_paths) / (time.perf_counter() - start)
+    print(f"{'cache, 304 revalidate':<26}{rps:>10.0f}{wire_total:>16}  [304]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark: end-of-speech to final transcript latency
+Streams a paced utterance through AIBackend using the local stub
+recognizer, once in batch mode (decode everything when speech ends) and
+once in streaming mode (decode each frame as it arrives).
+
+Run from the repo root:
+    python backend/benchmarks/bench_streaming_asr.py [utterance_seconds] [decode_cost]
+
+decode_cost is simulated recognizer compute, in seconds per second of audio.
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from main import ai_backend
+from streaming_asr import BYTES_PER_SECOND, StubStreamingRecognizer
+
+FRAME_MS = 32
+FRAME = bytes(BYTES_PER_SECOND * FRAME_MS // 1000)
+
+
+async def utterance(seconds: float, streaming: bool) -> float:
+    """Play one utterance in real time, return end-of-speech latency (ms)"""
+    stream = ai_backend.start_transcription()
+    pending = bytearray()
+    for _ in range(int(seconds * 1000 / FRAME_MS)):
+        frame_start = time.perf_counter()
+        if streaming:
+            await ai_backend.feed_transcription(stream, FRAME)
+        else:
+            pending.extend(FRAME)
+        # Next frame arrives one frame-duration later
+        await asyncio.sleep(max(0.0, FRAME_MS / 1000 - (time.perf_counter() - frame_start)))
+
+    end_of_speech = time.perf_counter()
+    if pending:
+        await ai_backend.feed_transcription(stream, bytes(pending))
+    await ai_backend.finish_transcription(stream)
+    return (time.perf_counter() - end_of_speech) * 1000
+
+
+async def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    decode_cost = float(sys.argv[2]) if len(sys.argv) > 2 else 0.3
+    ai_backend.streaming_recognizer = StubStreamingRecognizer(
+        decode_cost=decode_cost, finalize_cost=0.02
+    )
+
+    print(f"utterance {seconds:.1f}s, decode cost {decode_cost:.2f}s per audio second")
+    for name, streaming in (("batch", False), ("streaming", True)):
+        runs = [await utterance(seconds, streaming) for _ in range(3)]
+        print(f"{name:<10} end-of-speech -> final: {statistics.median(runs):8.1f} ms (median of 3)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
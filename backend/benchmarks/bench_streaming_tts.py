@@ -0,0 +1,64 @@
+"""
+Benchmark: time-to-first-audio for spoken replies
+Compares synthesizing the whole reply as one blob against per-sentence
+streaming, using a stub synthesizer whose cost grows with text length.
+
+Run from the repo root:
+    python backend/benchmarks/bench_streaming_tts.py [seconds_per_char]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import main
+from main import ai_backend
+
+REPLY = (
+    "Hi there, it's great to see you again! "
+    "The weather looks sunny this afternoon, so it's a good time for a walk. "
+    "Do you want me to remind you to bring water? "
+    "I can also keep track of your steps while you're out."
+)
+
+
+def stub_synthesizer(seconds_per_char: float):
+    def synthesize(text: str) -> bytes:
+        time.sleep(seconds_per_char * len(text))
+        return bytes(len(text) * 320)
+    return synthesize
+
+
+async def whole_reply() -> float:
+    start = time.perf_counter()
+    await ai_backend.generate_speech(REPLY)
+    return (time.perf_counter() - start) * 1000
+
+
+async def streamed_reply():
+    start = time.perf_counter()
+    first = None
+    async for _audio, last in ai_backend.stream_speech(REPLY):
+        if first is None:
+            first = (time.perf_counter() - start) * 1000
+    return first, (time.perf_counter() - start) * 1000
+
+
+async def run():
+    seconds_per_char = float(sys.argv[1]) if len(sys.argv) > 1 else 0.004
+    main.HAS_TTS = True
+    ai_backend._synthesize = stub_synthesizer(seconds_per_char)
+
+    print(f"reply: {len(REPLY)} chars, {len(main.split_sentences(REPLY))} sentences, "
+          f"{seconds_per_char * 1000:.1f} ms/char synthesis")
+    blob = await whole_reply()
+    first, total = await streamed_reply()
+    print(f"{'single blob':<18} time-to-first-audio {blob:8.1f} ms   complete {blob:8.1f} ms")
+    print(f"{'per sentence':<18} time-to-first-audio {first:8.1f} ms   complete {total:8.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
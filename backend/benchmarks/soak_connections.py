@@ -0,0 +1,72 @@
+"""
+Soak test: connection lifecycle
+Opens and closes WebSocket sessions in a loop - clean closes, malformed
+JSON, abrupt drops and duplicate client ids - and samples RSS and the
+live connection count. Both should stay flat.
+
+Run from the repo root:
+    python backend/benchmarks/soak_connections.py [cycles]
+"""
+
+import base64
+import gc
+import json
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from fastapi.testclient import TestClient
+
+from main import app, manager, jitter_buffers
+
+AUDIO_FRAME = json.dumps({
+    "type": "audio", "seq": 0, "timestamp": 0,
+    "chunks": [base64.b64encode(bytes(512)).decode()],
+})
+
+
+def rss_kb() -> int:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def cycle(client: TestClient, i: int):
+    kind = i % 4
+    client_id = f"soak_{i % 1000}" if kind == 3 else f"soak_{i}"
+    with client.websocket_connect(f"/ws/{client_id}") as ws:
+        if kind == 0:
+            ws.send_text(json.dumps({"type": "pong", "seq": 1}))
+        elif kind == 1:
+            ws.send_text("{not json")
+            ws.send_text(AUDIO_FRAME)
+        elif kind == 2:
+            ws.send_text(AUDIO_FRAME)
+            ws.close(code=1006)
+        else:
+            ws.send_text(json.dumps({"type": "ping", "seq": i}))
+            ws.receive_json()
+
+
+def main_loop(cycles: int):
+    logging.disable(logging.WARNING)
+    report_every = max(1, cycles // 10)
+    print(f"{'cycles':>8}{'rss_kb':>10}{'live':>6}{'jitter_stats':>14}{'cycles/s':>10}")
+    with TestClient(app) as client:
+        start = time.perf_counter()
+        for i in range(1, cycles + 1):
+            cycle(client, i)
+            if i % report_every == 0:
+                gc.collect()
+                rate = i / (time.perf_counter() - start)
+                print(f"{i:>8}{rss_kb():>10}{len(manager.active_connections):>6}"
+                      f"{len(jitter_buffers):>14}{rate:>10.0f}")
+
+
+if __name__ == "__main__":
+    main_loop(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,494 @@
+"""
+Wearable AI Companion - Event History Store
+Handles:
+- Append-only per-client history of gestures, voice turns and button presses
+- Columnar, memory-mapped segments written in batches
+- Time-range aggregates (counts, latency percentiles) that skip segments
+  outside the range and answer fully covered segments from their summaries
+
+On disk every client has a directory of fixed-size segments; each segment
+is one raw file per column plus a small JSON summary. The summary is
+written after the column data, so it is the commit point: rows past its
+count (e.g. after a crash mid-flush) are ignored.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Enum vocabularies; index 0 = not applicable, last = anything unrecognised
+EVENT_TYPES = ("gesture", "voice", "button")
+GESTURES = ("none", "wave", "flick", "shake", "tilt_left", "tilt_right",
+            "rotate_cw", "rotate_ccw", "other")
+EMOTIONS = ("none", "neutral", "happy", "sad", "confused", "angry", "curious",
+            "listening", "other")
+
+COLUMNS = {
+    "timestamp": "<f8",     # unix seconds, non-decreasing within a client
+    "event_type": "u1",
+    "gesture": "u1",
+    "intensity": "<f4",     # NaN when not a gesture
+    "emotion": "u1",
+    "latency_ms": "<f4",    # event in -> response out, NaN if none
+}
+
+LATENCY_PERCENTILES = (50, 90, 99)
+
+_EVENT_CODES = {name: i for i, name in enumerate(EVENT_TYPES)}
+_GESTURE_CODES = {name: i for i, name in enumerate(GESTURES)}
+_EMOTION_CODES = {name: i for i, name in enumerate(EMOTIONS)}
+_OTHER_GESTURE = len(GESTURES) - 1
+_OTHER_EMOTION = len(EMOTIONS) - 1
+
+
+def _client_dirname(client_id: str) -> str:
+    """Filesystem-safe directory name, unique per client id"""
+    safe = re.sub(r"[^A-Za-z0-9_-]", "_", client_id)[:64]
+    if safe == client_id:
+        return safe
+    return f"{safe}-{hashlib.sha1(client_id.encode()).hexdigest()[:8]}"
+
+
+def _next_segment_prefix(directory: str) -> str:
+    """Path prefix for a new segment, after every segment file on disk.
+
+    Scans the directory rather than counting loaded segments, so a segment
+    skipped by load() (unreadable summary) is never overwritten.
+    """
+    indices = [int(name.split(".", 1)[0]) for name in os.listdir(directory)
+               if name.split(".", 1)[0].isdigit()]
+    return os.path.join(directory, f"{max(indices, default=-1) + 1:06d}")
+
+
+def _named_counts(names: tuple, counts: np.ndarray) -> Dict[str, int]:
+    return {names[i]: int(n) for i, n in enumerate(counts) if n}
+
+
+class Segment:
+    """Fixed-capacity columnar block of one client's events"""
+
+    def __init__(self, prefix: str, capacity: int):
+        self.prefix = prefix
+        self.capacity = capacity
+        self.count = 0
+        self.t_min = math.inf
+        self.t_max = -math.inf
+        self.type_counts = np.zeros(len(EVENT_TYPES), dtype=np.int64)
+        self.gesture_counts = np.zeros(len(GESTURES), dtype=np.int64)
+        self.emotion_counts = np.zeros(len(EMOTIONS), dtype=np.int64)
+        self._columns: Optional[Dict[str, np.memmap]] = None
+
+    @classmethod
+    def create(cls, prefix: str, capacity: int) -> "Segment":
+        segment = cls(prefix, capacity)
+        segment._columns = {
+            name: np.memmap(f"{prefix}.{name}", dtype=dtype, mode="w+", shape=(capacity,))
+            for name, dtype in COLUMNS.items()
+        }
+        return segment
+
+    @classmethod
+    def from_meta(cls, prefix: str, meta: dict) -> "Segment":
+        segment = cls(prefix, meta["capacity"])
+        segment.count = meta["count"]
+        if segment.count:
+            segment.t_min, segment.t_max = meta["t_min"], meta["t_max"]
+        segment.type_counts[:] = meta["type_counts"]
+        segment.gesture_counts[:] = meta["gesture_counts"]
+        segment.emotion_counts[:] = meta["emotion_counts"]
+        return segment
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.capacity
+
+    def columns(self) -> Dict[str, np.memmap]:
+        """Column memmaps, mapped on first use"""
+        if self._columns is None:
+            self._columns = {
+                name: np.memmap(f"{self.prefix}.{name}", dtype=dtype, mode="r+", shape=(self.capacity,))
+                for name, dtype in COLUMNS.items()
+            }
+        return self._columns
+
+    def append(self, batch: Dict[str, np.ndarray], start: int, stop: int):
+        """Copy rows [start, stop) of a columnar batch after the last row"""
+        columns = self.columns()
+        n = stop - start
+        for name, values in batch.items():
+            columns[name][self.count:self.count + n] = values[start:stop]
+        ts = batch["timestamp"]
+        self.t_min = min(self.t_min, float(ts[start]))
+        self.t_max = max(self.t_max, float(ts[stop - 1]))
+        self.type_counts += np.bincount(batch["event_type"][start:stop], minlength=len(EVENT_TYPES))
+        self.gesture_counts += np.bincount(batch["gesture"][start:stop], minlength=len(GESTURES))
+        self.emotion_counts += np.bincount(batch["emotion"][start:stop], minlength=len(EMOTIONS))
+        self.count += n
+
+    def save_meta(self, client_id: Optional[str] = None):
+        meta = {
+            "capacity": self.capacity,
+            "count": self.count,
+            "t_min": self.t_min if self.count else None,
+            "t_max": self.t_max if self.count else None,
+            "type_counts": self.type_counts.tolist(),
+            "gesture_counts": self.gesture_counts.tolist(),
+            "emotion_counts": self.emotion_counts.tolist(),
+        }
+        if client_id is not None:
+            meta["client_id"] = client_id
+        tmp = f"{self.prefix}.json.tmp"
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, f"{self.prefix}.json")
+
+    def close(self):
+        if self._columns is not None:
+            for column in self._columns.values():
+                column.flush()
+            self._columns = None
+
+
+class ClientHistory:
+    """Segments plus not-yet-flushed rows for one client"""
+
+    def __init__(self, client_id: str, directory: str):
+        self.client_id = client_id
+        self.directory = directory
+        self.segments: List[Segment] = []
+        self.pending: List[tuple] = []
+        self.last_ts = -math.inf
+        self.uncommitted = False  # rows written whose summary is not saved yet
+
+
+class EventStore:
+    """Append-only columnar event history with batched, memory-mapped writes.
+
+    record() only appends a tuple to an in-memory list; rows reach the
+    segments in batches, either when a client has batch_size pending rows
+    or from the periodic flush task. Segment summaries (the commit point)
+    are saved by flush() and when a segment fills, not per batch.
+
+    Client ids come from the connection URL, so resources are bounded per
+    store, not per client: at most max_mapped segments are memory-mapped
+    (each map holds one fd per column) and at most max_clients histories
+    stay in memory. Others are committed, unmapped and re-read from their
+    summaries on the next record or query.
+    """
+
+    def __init__(self, root: str, segment_rows: int = 1 << 16,
+                 batch_size: int = 256, flush_interval: float = 1.0,
+                 max_clients: int = 256, max_mapped: int = 64):
+        self.root = root
+        self.segment_rows = segment_rows
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_clients = max_clients
+        self.max_mapped = max_mapped
+        self.clients: "OrderedDict[str, ClientHistory]" = OrderedDict()
+        self._mapped: "OrderedDict[Segment, None]" = OrderedDict()
+        self.recorded = 0
+        self.dropped = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def load(self):
+        """Create the store directory; histories are read lazily per client"""
+        os.makedirs(self.root, exist_ok=True)
+        clients = sum(os.path.isdir(os.path.join(self.root, d)) for d in os.listdir(self.root))
+        logger.info(f"Event store: {clients} clients on disk")
+
+    def _read_history(self, client_id: Optional[str], directory: str) -> Optional[ClientHistory]:
+        """Rebuild a client's segment index from its summaries (no column data)"""
+        try:
+            filenames = sorted(os.listdir(directory))
+        except FileNotFoundError:
+            return None
+        segments = []
+        stored_id = None
+        for filename in filenames:
+            if not filename.endswith(".json"):
+                continue
+            prefix = os.path.join(directory, filename[:-len(".json")])
+            try:
+                with open(f"{prefix}.json") as f:
+                    meta = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable event segment {prefix}: {e}")
+                continue
+            stored_id = meta.get("client_id", stored_id)
+            segments.append(Segment.from_meta(prefix, meta))
+        if not segments:
+            return None
+        history = ClientHistory(client_id or stored_id or os.path.basename(directory), directory)
+        history.segments = segments
+        history.last_ts = max((s.t_max for s in segments if s.count), default=-math.inf)
+        return history
+
+    def _history(self, client_id: str, create: bool) -> Optional[ClientHistory]:
+        """In-memory history for a client, reading it from disk if evicted"""
+        history = self.clients.get(client_id)
+        if history is not None:
+            self.clients.move_to_end(client_id)
+            return history
+        directory = os.path.join(self.root, _client_dirname(client_id))
+        history = self._read_history(client_id, directory)
+        if history is None:
+            if not create:
+                return None
+            history = ClientHistory(client_id, directory)
+        self.clients[client_id] = history
+        while len(self.clients) > self.max_clients:
+            _, evicted = self.clients.popitem(last=False)
+            self._release(evicted)
+        return history
+
+    def _release(self, history: ClientHistory):
+        """Commit a history leaving memory and unmap its segments"""
+        if history.pending:
+            self._flush_client(history)
+        self._commit(history)
+        for segment in history.segments:
+            self._mapped.pop(segment, None)
+            segment.close()
+
+    def _columns(self, segment: Segment) -> Dict[str, np.memmap]:
+        """Segment columns through the LRU of mapped segments"""
+        if segment in self._mapped:
+            self._mapped.move_to_end(segment)
+        else:
+            self._mapped[segment] = None
+            while len(self._mapped) > self.max_mapped:
+                old, _ = self._mapped.popitem(last=False)
+                old.close()
+        return segment.columns()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_periodically())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self.flush()
+        while self._mapped:
+            segment, _ = self._mapped.popitem(last=False)
+            segment.close()
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self.flush()
+
+    # Hot path
+
+    def record(self, client_id: str, event_type: str, gesture: Optional[str] = None,
+               intensity: Optional[float] = None, emotion: Optional[str] = None,
+               latency_ms: Optional[float] = None):
+        """Queue one event; cheap enough to call from the message loop"""
+        history = self._history(client_id, create=True)
+        # Keep timestamps sorted within a client so range lookups can bisect
+        ts = max(time.time(), history.last_ts)
+        history.last_ts = ts
+        try:
+            intensity = math.nan if intensity is None else float(intensity)
+        except (TypeError, ValueError):
+            intensity = math.nan
+        history.pending.append((
+            ts,
+            _EVENT_CODES[event_type],
+            _GESTURE_CODES.get(gesture or "none", _OTHER_GESTURE),
+            intensity,
+            _EMOTION_CODES.get(emotion or "none", _OTHER_EMOTION),
+            math.nan if latency_ms is None else latency_ms,
+        ))
+        self.recorded += 1
+        if len(history.pending) >= self.batch_size:
+            self._flush_client(history)
+
+    # Writes
+
+    def flush(self):
+        """Write every client's pending rows and commit them"""
+        for history in self.clients.values():
+            if history.pending:
+                self._flush_client(history)
+            self._commit(history)
+
+    def _commit(self, history: ClientHistory):
+        if history.uncommitted:
+            try:
+                history.segments[-1].save_meta(history.client_id)
+                history.uncommitted = False
+            except OSError as e:
+                logger.error(f"Event store commit failed for {history.client_id}: {e}")
+
+    def _flush_client(self, history: ClientHistory):
+        rows, history.pending = history.pending, []
+        batch = {
+            name: np.array(values, dtype=dtype)
+            for (name, dtype), values in zip(COLUMNS.items(), zip(*rows))
+        }
+        try:
+            os.makedirs(history.directory, exist_ok=True)
+            pos = 0
+            while pos < len(rows):
+                segment = history.segments[-1] if history.segments else None
+                if segment is None or segment.full:
+                    if segment is not None:
+                        segment.save_meta(history.client_id)
+                        self._mapped.pop(segment, None)
+                        segment.close()
+                    segment = Segment.create(_next_segment_prefix(history.directory), self.segment_rows)
+                    history.segments.append(segment)
+                    self._columns(segment)
+                n = min(len(rows) - pos, segment.capacity - segment.count)
+                self._columns(segment)
+                segment.append(batch, pos, pos + n)
+                history.uncommitted = True
+                pos += n
+        except OSError as e:
+            self.dropped += len(rows)
+            logger.error(f"Event store flush failed for {history.client_id}: {e}")
+
+    # Queries
+
+    def recent(self, client_id: str, limit: int = 10) -> List[dict]:
+        """Last few events for one client, oldest first"""
+        if limit <= 0:
+            return []
+        history = self._history(client_id, create=False)
+        if history is None:
+            return []
+        rows = history.pending[-limit:]
+        segments = history.segments
+        i = len(segments) - 1
+        while len(rows) < limit and i >= 0:
+            segment = segments[i]
+            take = min(limit - len(rows), segment.count)
+            if take:
+                columns = self._columns(segment)
+                tail = zip(*(columns[name][segment.count - take:segment.count].tolist()
+                             for name in COLUMNS))
+                rows = list(tail) + rows
+            i -= 1
+        return [{
+            "timestamp": ts,
+            "event_type": EVENT_TYPES[event_type],
+            "gesture": GESTURES[gesture],
+            "intensity": None if math.isnan(intensity) else round(intensity, 3),
+            "emotion": EMOTIONS[emotion],
+            "latency_ms": None if math.isnan(latency) else round(latency, 1),
+        } for ts, event_type, gesture, intensity, emotion, latency in rows]
+
+    def query(self, client_id: Optional[str] = None, start: Optional[float] = None,
+              end: Optional[float] = None) -> dict:
+        """Aggregates over [start, end] for one client, or all clients.
+
+        Segments outside the range are skipped on their summary; segments
+        inside it contribute their stored counts; only segments straddling
+        a bound are bisected. Latency percentiles read just the latency and
+        type columns of the rows in range.
+        """
+        self.flush()
+        start = -math.inf if start is None else start
+        end = math.inf if end is None else end
+        if client_id is None:
+            histories = self._all_histories()
+        else:
+            history = self._history(client_id, create=False)
+            histories = [history] if history is not None else []
+
+        type_counts = np.zeros(len(EVENT_TYPES), dtype=np.int64)
+        gesture_counts = np.zeros(len(GESTURES), dtype=np.int64)
+        emotion_counts = np.zeros(len(EMOTIONS), dtype=np.int64)
+        latencies, latency_types = [], []
+        scanned = skipped = 0
+
+        for history in histories:
+            for segment in history.segments:
+                if not segment.count or segment.t_max < start or segment.t_min > end:
+                    skipped += 1
+                    continue
+                scanned += 1
+                columns = self._columns(segment)
+                if start <= segment.t_min and segment.t_max <= end:
+                    lo, hi = 0, segment.count
+                    type_counts += segment.type_counts
+                    gesture_counts += segment.gesture_counts
+                    emotion_counts += segment.emotion_counts
+                else:
+                    ts = columns["timestamp"][:segment.count]
+                    lo = int(np.searchsorted(ts, start, side="left"))
+                    hi = int(np.searchsorted(ts, end, side="right"))
+                    type_counts += np.bincount(columns["event_type"][lo:hi], minlength=len(EVENT_TYPES))
+                    gesture_counts += np.bincount(columns["gesture"][lo:hi], minlength=len(GESTURES))
+                    emotion_counts += np.bincount(columns["emotion"][lo:hi], minlength=len(EMOTIONS))
+                latency = columns["latency_ms"][lo:hi]
+                measured = ~np.isnan(latency)
+                latencies.append(latency[measured])
+                latency_types.append(columns["event_type"][lo:hi][measured])
+
+        latency_ms = {}
+        if latencies:
+            latency = np.concatenate(latencies)
+            kinds = np.concatenate(latency_types)
+            for code, name in enumerate(EVENT_TYPES):
+                values = latency[kinds == code]
+                if values.size:
+                    pcts = np.percentile(values, LATENCY_PERCENTILES)
+                    latency_ms[name] = {"count": int(values.size)}
+                    latency_ms[name].update(
+                        {f"p{p}": round(float(v), 1) for p, v in zip(LATENCY_PERCENTILES, pcts)})
+
+        # Gesture counts only make sense for gesture events ("none" = other types)
+        gesture_counts[0] = 0
+        emotion_counts[0] = 0
+        return {
+            "clients": len(histories),
+            "events": int(type_counts.sum()),
+            "event_types": _named_counts(EVENT_TYPES, type_counts),
+            "gestures": _named_counts(GESTURES, gesture_counts),
+            "emotions": _named_counts(EMOTIONS, emotion_counts),
+            "latency_ms": latency_ms,
+            "segments_scanned": scanned,
+            "segments_skipped": skipped,
+        }
+
+    def _all_histories(self) -> List[ClientHistory]:
+        """Every client on disk; evicted ones are read without caching them"""
+        in_memory = {history.directory: history for history in self.clients.values()}
+        histories = []
+        try:
+            dirnames = sorted(os.listdir(self.root))
+        except FileNotFoundError:
+            dirnames = []
+        for dirname in dirnames:
+            directory = os.path.join(self.root, dirname)
+            history = in_memory.pop(directory, None) or self._read_history(None, directory)
+            if history is not None:
+                histories.append(history)
+        # Clients whose first flush failed have no directory yet
+        histories.extend(h for h in in_memory.values() if h.segments)
+        return histories
+
+    def snapshot(self) -> dict:
+        return {
+            "clients": len(self.clients),
+            "mapped_segments": len(self._mapped),
+            "recorded": self.recorded,
+            "pending": sum(len(h.pending) for h in self.clients.values()),
+            "dropped": self.dropped,
+            "segments": sum(len(h.segments) for h in self.clients.values()),
+        }
@@ -0,0 +1,346 @@
+"""
+Wearable AI Companion - Offline Gesture Evaluation
+Handles:
+- Loading labeled IMU recordings into NumPy arrays
+- Replaying GestureDetector (m5stickc-firmware/gesture_detector.h)
+  vectorized over whole recordings
+- Grid / random threshold search across CPU cores with precision, recall
+  and confusion matrices per gesture
+
+Recordings live in one folder per label, e.g. recordings/wave/001.csv,
+recordings/none/idle.csv. CSV columns: ax, ay, az, gx, gy, gz (values as
+readIMU() produces them, one row per 10 ms sample); other columns are
+ignored. .npz files with an `imu` (N x 6) array work too.
+
+Usage:
+    python gesture_tuning.py recordings/ --search random --trials 2000
+    python gesture_tuning.py --synthetic 3000 --search grid
+"""
+
+import argparse
+import itertools
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+logger = logging.getLogger(__name__)
+
+# Mirrors GestureDetector
+BUFFER_SIZE = 20
+SAMPLE_INTERVAL_MS = 10  # SENSOR_INTERVAL in the firmware
+GESTURE_COOLDOWN_MS = 500
+
+# Label order; index 0 is "no gesture" like GESTURE_NONE
+LABELS = ["none", "wave", "flick", "shake", "tilt_left", "tilt_right", "rotate_cw", "rotate_ccw"]
+LABEL_INDEX = {name: i for i, name in enumerate(LABELS)}
+
+# Current firmware constants. SHAKE_INTENSITY is declared in the header
+# but never read, so the shake gate tuned here is the zero-crossing count.
+DEFAULT_THRESHOLDS = {
+    "ACCEL_THRESHOLD": 2.0,
+    "GYRO_THRESHOLD": 50.0,
+    "WAVE_ACCEL_MIN": 1.5,
+    "WAVE_ACCEL_MAX": 3.0,
+    "FLICK_THRESHOLD": 5.0,
+    "SHAKE_MIN_CROSSINGS": 8,
+}
+
+SEARCH_SPACE = {
+    "ACCEL_THRESHOLD": np.arange(1.0, 4.01, 0.25),
+    "GYRO_THRESHOLD": np.arange(20.0, 150.1, 10.0),
+    "WAVE_ACCEL_MIN": np.arange(0.5, 3.01, 0.25),
+    "WAVE_ACCEL_MAX": np.arange(2.0, 6.01, 0.5),
+    "FLICK_THRESHOLD": np.arange(3.0, 12.01, 0.5),
+    "SHAKE_MIN_CROSSINGS": np.arange(4, 16),
+}
+
+
+class RecordingSet:
+    """Recordings padded into (R, T) arrays plus per-sample window features.
+
+    Features depend only on the data, never on thresholds, so they are
+    computed once and every threshold set is just a few comparisons.
+    """
+
+    def __init__(self, recordings: List[np.ndarray], labels: List[str]):
+        self.labels = np.array([LABEL_INDEX[label] for label in labels])
+        lengths = np.array([len(r) for r in recordings])
+        count, length = len(recordings), int(lengths.max())
+
+        # The detector's buffer starts zeroed: prepend BUFFER_SIZE - 1 zeros
+        pad = BUFFER_SIZE - 1
+        imu = np.zeros((count, pad + length, 6), dtype=np.float32)
+        for i, rec in enumerate(recordings):
+            imu[i, pad:pad + len(rec)] = rec
+        self.valid = np.arange(length)[None, :] < lengths[:, None]
+
+        ax, ay, gz = imu[..., 0], imu[..., 1], imu[..., 5]
+        window = lambda x: sliding_window_view(x, BUFFER_SIZE, axis=1)
+
+        # Wave: maxY / minY start at 0 in detectWave
+        self.range_y = np.maximum(window(ay).max(-1), 0) - np.minimum(window(ay).min(-1), 0)
+        magnitude = np.sqrt((imu[..., :3] ** 2).sum(-1))
+        self.max_accel = window(magnitude).max(-1)
+        self.avg_x = window(ax).mean(-1)
+        self.avg_gz = window(gz).mean(-1)
+        self.crossings = self._array_order_crossings(ax, length)
+
+    @staticmethod
+    def _array_order_crossings(ax: np.ndarray, length: int) -> np.ndarray:
+        """Zero crossings exactly as detectShake counts them.
+
+        detectShake walks the circular buffer in array order, so it skips
+        the real pair that straddles index 19 -> 0 and instead compares the
+        newest sample with the oldest one.
+        """
+        crosses = lambda a, b: ((a > 0) & (b < 0)) | ((a < 0) & (b > 0))
+        pad = BUFFER_SIZE - 1
+        # c[j]: crossing between padded samples j-1 and j
+        c = np.zeros(ax.shape, dtype=np.int16)
+        c[:, 1:] = crosses(ax[:, :-1], ax[:, 1:])
+        csum = np.concatenate((np.zeros((ax.shape[0], 1), np.int32), np.cumsum(c, axis=1)), axis=1)
+
+        t = np.arange(length)
+        j = t + pad  # padded index of the newest sample
+        temporal = csum[:, j + 1] - csum[:, j + 1 - pad]  # 19 adjacent pairs in window
+
+        p = t % BUFFER_SIZE  # bufferIndex the newest sample was written to
+        wraps = p != BUFFER_SIZE - 1
+        skipped = np.where(wraps, c[:, j - p], 0)  # pair ending at array slot 0
+        newest_oldest = np.where(wraps, crosses(ax[:, j], ax[:, j - pad]), 0)
+        return temporal - skipped + newest_oldest
+
+    def candidates(self, th: Dict[str, float]) -> np.ndarray:
+        """(R, T) label index the detector would report at every sample"""
+        wave = (self.range_y > th["WAVE_ACCEL_MIN"]) & (self.range_y < th["WAVE_ACCEL_MAX"])
+        flick = self.max_accel > th["FLICK_THRESHOLD"]
+        shake = self.crossings > th["SHAKE_MIN_CROSSINGS"]
+        tilt_right = self.avg_x > th["ACCEL_THRESHOLD"]
+        tilt_left = self.avg_x < -th["ACCEL_THRESHOLD"]
+        rotate_cw = self.avg_gz > th["GYRO_THRESHOLD"]
+        rotate_ccw = self.avg_gz < -th["GYRO_THRESHOLD"]
+
+        # Same priority order as GestureDetector::detect
+        code = np.select(
+            [wave, flick, shake, tilt_right, tilt_left, rotate_cw, rotate_ccw],
+            [LABEL_INDEX[n] for n in
+             ("wave", "flick", "shake", "tilt_right", "tilt_left", "rotate_cw", "rotate_ccw")],
+            default=0,
+        )
+        return np.where(self.valid, code, 0)
+
+    def predict(self, th: Dict[str, float]) -> np.ndarray:
+        """First gesture reported in each recording (0 = none)"""
+        code = self.candidates(th)
+        fired = code > 0
+        first = fired.argmax(axis=1)
+        return np.where(fired.any(axis=1), code[np.arange(len(code)), first], 0)
+
+    def replay(self, th: Dict[str, float], index: int) -> List[Tuple[int, str]]:
+        """All (time_ms, gesture) events for one recording, with cooldown"""
+        code = self.candidates(th)[index]
+        times = np.flatnonzero(code)
+        cooldown = GESTURE_COOLDOWN_MS // SAMPLE_INTERVAL_MS
+        events, pos = [], 0
+        # One iteration per reported gesture, not per sample
+        while pos < len(times):
+            t = times[pos]
+            events.append((int(t) * SAMPLE_INTERVAL_MS, LABELS[code[t]]))
+            pos = np.searchsorted(times, t + cooldown)
+        return events
+
+
+def confusion_matrix(truth: np.ndarray, predicted: np.ndarray) -> np.ndarray:
+    n = len(LABELS)
+    return np.bincount(truth * n + predicted, minlength=n * n).reshape(n, n)
+
+
+def scores(matrix: np.ndarray) -> Dict[str, Dict[str, float]]:
+    """Per-gesture precision / recall / F1 from a confusion matrix"""
+    tp = np.diag(matrix).astype(float)
+    predicted = matrix.sum(axis=0)
+    actual = matrix.sum(axis=1)
+    precision = np.divide(tp, predicted, out=np.zeros_like(tp), where=predicted > 0)
+    recall = np.divide(tp, actual, out=np.zeros_like(tp), where=actual > 0)
+    f1 = np.divide(2 * precision * recall, precision + recall,
+                   out=np.zeros_like(tp), where=(precision + recall) > 0)
+    return {
+        LABELS[i]: {"precision": precision[i], "recall": recall[i], "f1": f1[i], "support": int(actual[i])}
+        for i in range(len(LABELS))
+    }
+
+
+def macro_f1(matrix: np.ndarray) -> float:
+    per_label = scores(matrix)
+    present = [s["f1"] for name, s in per_label.items() if name != "none" and s["support"] > 0]
+    return float(np.mean(present)) if present else 0.0
+
+
+# Worker processes get the dataset once through the pool initializer
+_worker_data: Optional[RecordingSet] = None
+
+
+def _init_worker(data: RecordingSet):
+    global _worker_data
+    _worker_data = data
+
+
+def _evaluate_batch(batch: List[Dict[str, float]]) -> List[Tuple[float, Dict[str, float]]]:
+    results = []
+    for th in batch:
+        matrix = confusion_matrix(_worker_data.labels, _worker_data.predict(th))
+        results.append((macro_f1(matrix), th))
+    return results
+
+
+def parameter_sets(search: str, trials: Optional[int], seed: int = 0) -> List[Dict[str, float]]:
+    names = list(SEARCH_SPACE)
+    if search == "grid":
+        # Coarse grid: every other point per axis keeps the product tractable
+        axes = [SEARCH_SPACE[name][::2] for name in names]
+        combos = itertools.product(*axes)
+    else:
+        rng = np.random.default_rng(seed)
+        combos = zip(*(rng.choice(SEARCH_SPACE[name], trials or 2000) for name in names))
+
+    sets = []
+    for values in combos:
+        th = {name: float(v) for name, v in zip(names, values)}
+        if th["WAVE_ACCEL_MIN"] < th["WAVE_ACCEL_MAX"]:
+            sets.append(th)
+        if search == "grid" and trials and len(sets) >= trials:
+            break
+    return sets
+
+
+def search_thresholds(data: RecordingSet, candidates: List[Dict[str, float]],
+                      workers: Optional[int] = None, batch_size: int = 32):
+    """Evaluate every candidate in parallel, best (score, thresholds) first"""
+    batches = [candidates[i:i + batch_size] for i in range(0, len(candidates), batch_size)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(data,)) as pool:
+        results = [r for batch in pool.map(_evaluate_batch, batches) for r in batch]
+    return sorted(results, key=lambda r: r[0], reverse=True)
+
+
+def load_recordings(root: str) -> Tuple[List[np.ndarray], List[str]]:
+    """Read <root>/<label>/*.csv|*.npz into (N x 6) float arrays"""
+    recordings, labels = [], []
+    for label in sorted(os.listdir(root)):
+        folder = os.path.join(root, label)
+        if not os.path.isdir(folder):
+            continue
+        if label not in LABEL_INDEX:
+            logger.warning(f"Skipping {folder}: not a gesture label ({', '.join(LABELS)})")
+            continue
+        for name in sorted(os.listdir(folder)):
+            path = os.path.join(folder, name)
+            if name.endswith(".npz"):
+                imu = np.load(path)["imu"]
+            elif name.endswith(".csv"):
+                table = np.genfromtxt(path, delimiter=",", names=True)
+                imu = np.column_stack([table[c] for c in ("ax", "ay", "az", "gx", "gy", "gz")])
+            else:
+                continue
+            recordings.append(np.asarray(imu, dtype=np.float32).reshape(-1, 6))
+            labels.append(label)
+    return recordings, labels
+
+
+def synthetic_recordings(count: int, seconds: float = 2.0, seed: int = 0):
+    """Labeled fake recordings for trying the harness without a device"""
+    rng = np.random.default_rng(seed)
+    n = int(seconds * 1000 / SAMPLE_INTERVAL_MS)
+    t = np.arange(n) * SAMPLE_INTERVAL_MS / 1000
+    recordings, labels = [], []
+    for i in range(count):
+        label = LABELS[i % len(LABELS)]
+        imu = rng.normal(0, 0.05, (n, 6)).astype(np.float32)
+        imu[:, 3:] *= 100   # gyro noise in deg/s
+        imu[:, 0] += 0.1    # slight resting tilt keeps X off zero
+        imu[:, 2] += 1.0    # gravity
+        active = (t > 0.5) & (t < 1.2)
+        amp = rng.uniform(0.7, 1.3)
+        if label == "wave":
+            imu[active, 1] += amp * 1.1 * np.sin(2 * np.pi * 2 * t[active])
+        elif label == "flick":
+            imu[(t > 0.8) & (t < 0.85), 0] += amp * 7
+        elif label == "shake":
+            imu[active, 0] += amp * 3 * np.sign(np.sin(2 * np.pi * 12 * t[active]))
+        elif label.startswith("tilt"):
+            imu[active, 0] += amp * (3 if label == "tilt_right" else -3)
+        elif label.startswith("rotate"):
+            imu[active, 5] += amp * (120 if label == "rotate_cw" else -120)
+        recordings.append(imu)
+        labels.append(label)
+    return recordings, labels
+
+
+def format_report(data: RecordingSet, th: Dict[str, float]) -> str:
+    matrix = confusion_matrix(data.labels, data.predict(th))
+    lines = [f"macro F1: {macro_f1(matrix):.3f}", "",
+             f"{'gesture':<12}{'precision':>10}{'recall':>8}{'f1':>7}{'support':>9}"]
+    for name, s in scores(matrix).items():
+        lines.append(f"{name:<12}{s['precision']:>10.2f}{s['recall']:>8.2f}{s['f1']:>7.2f}{s['support']:>9}")
+
+    width = max(len(n) for n in LABELS) + 1
+    lines += ["", "confusion (rows = truth, columns = predicted)",
+              " " * width + "".join(f"{n[:6]:>7}" for n in LABELS)]
+    for i, name in enumerate(LABELS):
+        lines.append(f"{name:<{width}}" + "".join(f"{v:>7}" for v in matrix[i]))
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate and tune GestureDetector thresholds offline")
+    parser.add_argument("recordings", nargs="?", help="folder with one subfolder per label")
+    parser.add_argument("--synthetic", type=int, default=0, help="use N generated recordings instead")
+    parser.add_argument("--search", choices=["none", "grid", "random"], default="random")
+    parser.add_argument("--trials", type=int, default=None,
+                        help="random: samples (default 2000); grid: cap on points (default all)")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        recordings, labels = synthetic_recordings(args.synthetic, seed=args.seed)
+    elif args.recordings:
+        recordings, labels = load_recordings(args.recordings)
+    else:
+        parser.error("give a recordings folder or --synthetic N")
+    if not recordings:
+        parser.error("no recordings found")
+
+    start = time.perf_counter()
+    data = RecordingSet(recordings, labels)
+    print(f"{len(recordings)} recordings, features in {time.perf_counter() - start:.1f}s\n")
+    print("== current firmware thresholds ==")
+    print(format_report(data, DEFAULT_THRESHOLDS))
+
+    if args.search == "none":
+        return
+
+    candidates = parameter_sets(args.search, args.trials, args.seed)
+    start = time.perf_counter()
+    results = search_thresholds(data, candidates, args.workers)
+    elapsed = time.perf_counter() - start
+    best_score, best = results[0]
+    print(f"\n== best of {len(candidates)} {args.search} candidates "
+          f"({elapsed:.1f}s, {len(candidates) / elapsed:.0f} sets/s) ==")
+    print(format_report(data, best))
+    print("\n// gesture_detector.h")
+    for name, value in best.items():
+        if name == "SHAKE_MIN_CROSSINGS":
+            print(f"// detectShake: if(zeroXings > {int(value)})")
+        elif name == "FLICK_THRESHOLD":
+            print(f"// detectFlick: if(maxAccel > {value:.2f})")
+        else:
+            print(f"const float {name} = {value:.2f};")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Wearable AI Companion - Audio Jitter Buffer
+Handles:
+- Reordering sequenced audio frames within a small window
+- Concealing lost frames with silence or linear interpolation
+- Per-device loss / reorder statistics
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+CONCEAL_SILENCE = "silence"
+CONCEAL_INTERPOLATE = "interpolate"
+
+
+class JitterBuffer:
+    """Per-client reorder buffer for sequenced 16-bit PCM audio frames"""
+
+    def __init__(self, window: int = 4, concealment: str = CONCEAL_INTERPOLATE):
+        self.window = window
+        self.concealment = concealment
+        self.next_seq: Optional[int] = None
+        self.pending: Dict[int, bytes] = {}
+        self.last_frame = b""
+        self.stats = {
+            "received": 0,
+            "unsequenced": 0,
+            "reordered": 0,
+            "late": 0,
+            "duplicate": 0,
+            "lost": 0,
+            "resyncs": 0,           # jumps past the window; not counted as lost
+            "concealed_bytes": 0,
+            "last_capture_ts": None,
+        }
+
+    def reset(self):
+        """Start a new stream (device reconnected) keeping cumulative stats"""
+        self.next_seq = None
+        self.pending.clear()
+        self.last_frame = b""
+
+    def push(self, payload: bytes, seq: Optional[int] = None,
+             capture_ts: Optional[int] = None) -> List[bytes]:
+        """Add a frame and return the frames that are now ready, in order"""
+        self.stats["received"] += 1
+        if capture_ts is not None:
+            self.stats["last_capture_ts"] = capture_ts
+
+        # Legacy firmware without sequence numbers: pass straight through
+        if seq is None:
+            self.stats["unsequenced"] += 1
+            self.last_frame = payload
+            return [payload]
+
+        if self.next_seq is None:
+            self.next_seq = seq
+
+        if seq < self.next_seq:
+            self.stats["late"] += 1
+            return []
+        if seq in self.pending:
+            self.stats["duplicate"] += 1
+            return []
+        if any(s > seq for s in self.pending):
+            self.stats["reordered"] += 1
+
+        self.pending[seq] = payload
+        return self._drain()
+
+    def flush(self) -> List[bytes]:
+        """Release everything still held, concealing any gaps"""
+        ready = []
+        while self.pending:
+            ready.extend(self._release_next(force=True))
+        return ready
+
+    def _drain(self) -> List[bytes]:
+        ready = []
+        while self.pending:
+            if self.next_seq in self.pending:
+                ready.extend(self._release_next())
+            elif max(self.pending) - self.next_seq >= self.window:
+                # Oldest missing frame fell out of the reorder window
+                ready.extend(self._release_next(force=True))
+            else:
+                break
+        return ready
+
+    def _release_next(self, force: bool = False) -> List[bytes]:
+        payload = self.pending.pop(self.next_seq, None)
+        if payload is None:
+            if not force:
+                return []
+            # Skip straight to the oldest frame we actually hold
+            target = min(self.pending)
+            missing = target - self.next_seq
+            if missing > self.window:
+                # Sequence jumped (counter reset, bad client): resync, no filler
+                self.stats["resyncs"] += 1
+                out = []
+            else:
+                out = self._conceal(missing, self.pending[target])
+            self.next_seq = target
+            payload = self.pending.pop(target)
+            out.append(payload)
+        else:
+            out = [payload]
+
+        self.last_frame = payload
+        self.next_seq += 1
+        return out
+
+    def _conceal(self, missing: int, following: bytes) -> List[bytes]:
+        """Synthesize `missing` frames bridging last_frame and following"""
+        size = len(self.last_frame) or len(following)
+        size -= size % 2
+        self.stats["lost"] += missing
+        self.stats["concealed_bytes"] += size * missing
+
+        if self.concealment != CONCEAL_INTERPOLATE or len(self.last_frame) < 2 or len(following) < 2:
+            return [bytes(size)] * missing
+
+        # One linear ramp across the whole gap, split back into frames
+        start = np.frombuffer(self.last_frame[-2:], dtype="<i2")[0]
+        end = np.frombuffer(following[:2], dtype="<i2")[0]
+        samples = size // 2
+        ramp = np.linspace(start, end, samples * missing + 2)[1:-1].astype("<i2")
+        return [ramp[i * samples:(i + 1) * samples].tobytes() for i in range(missing)]
+
+    def snapshot(self) -> dict:
+        """Stats for the /audio/stats endpoint"""
+        stats = dict(self.stats)
+        stats["buffered"] = len(self.pending)
+        stats["loss_rate"] = (
+            stats["lost"] / (stats["lost"] + stats["received"])
+            if stats["lost"] + stats["received"] else 0.0
+        )
+        return stats
@@ -0,0 +1,130 @@
+"""
+Wearable AI Companion - Event Loop Monitor
+Handles:
+- Sampling asyncio scheduling delay into a latency histogram
+- Detecting slow (blocking) callbacks and capturing their stack
+- Time-boxed sampling profiles in collapsed-stack (flame graph) format
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds in milliseconds
+LAG_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, float("inf"))
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop runs a periodic tick"""
+
+    def __init__(self, interval: float = 0.25, slow_threshold: float = 0.1,
+                 max_slow_events: int = 20):
+        self.interval = interval
+        self.slow_threshold = slow_threshold
+        self.histogram = [0] * len(LAG_BUCKETS_MS)
+        self.max_lag = 0.0
+        self.samples = 0
+        self.slow_events = deque(maxlen=max_slow_events)
+        self.loop_thread_id: Optional[int] = None
+        self._last_tick = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._running = False
+
+    def start(self):
+        """Start sampling on the running loop (call from startup)"""
+        if self._running:
+            return
+        self._running = True
+        self.loop_thread_id = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._sample())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    def stop(self):
+        self._running = False
+        if self._task:
+            self._task.cancel()
+
+    async def _sample(self):
+        while self._running:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._last_tick = now
+            self._record(max(0.0, now - expected))
+
+    def _record(self, lag: float):
+        lag_ms = lag * 1000
+        for i, bound in enumerate(LAG_BUCKETS_MS):
+            if lag_ms <= bound:
+                self.histogram[i] += 1
+                break
+        self.samples += 1
+        self.max_lag = max(self.max_lag, lag)
+
+    def _watch(self):
+        """Background thread: grab the loop's stack while it is blocked"""
+        captured_for = None
+        while self._running:
+            time.sleep(self.slow_threshold / 2)
+            last_tick = self._last_tick
+            stalled = time.monotonic() - last_tick - self.interval
+            if stalled < self.slow_threshold or captured_for == last_tick:
+                continue
+            frame = sys._current_frames().get(self.loop_thread_id)
+            if frame is None:
+                continue
+            captured_for = last_tick
+            stack = "".join(traceback.format_stack(frame))
+            self.slow_events.append({
+                "detected_at": time.time(),
+                "blocked_ms": round(stalled * 1000, 1),
+                "stack": stack,
+            })
+            code = frame.f_code
+            logger.warning(f"Event loop blocked for {stalled * 1000:.0f}ms in "
+                           f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+
+    def snapshot(self) -> dict:
+        """Histogram and slow-callback report for the admin endpoint"""
+        return {
+            "samples": self.samples,
+            "interval_ms": self.interval * 1000,
+            "max_lag_ms": round(self.max_lag * 1000, 2),
+            "histogram_ms": {
+                ("+Inf" if bound == float("inf") else str(bound)): count
+                for bound, count in zip(LAG_BUCKETS_MS, self.histogram)
+            },
+            "slow_threshold_ms": self.slow_threshold * 1000,
+            "slow_callbacks": list(self.slow_events),
+        }
+
+
+def sample_profile(thread_id: int, duration: float, interval: float = 0.005) -> str:
+    """Sample one thread's stack for `duration` seconds (run off-loop).
+
+    Returns collapsed stacks ("outer;inner count" per line) ready for
+    flamegraph.pl / speedscope.
+    """
+    stacks = Counter()
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        frame = sys._current_frames().get(thread_id)
+        if frame is not None:
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+                frame = frame.f_back
+            stacks[";".join(reversed(names))] += 1
+        time.sleep(interval)
+    return "\n".join(f"{stack} {count}" for stack, count in stacks.most_common())
@@ -11,16 +11,32 @@ Handles:
 import asyncio
 import json
 import base64
+import os
+import re
+import secrets
+import struct
+import tempfile
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
 import numpy as np
-from typing import Optional, Dict
+from typing import AsyncIterator, Optional, Dict, List, Tuple
 from datetime import datetime
 import logging
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse, FileResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Header, HTTPException
+from fastapi.responses import HTMLResponse, PlainTextResponse
 import uvicorn
 
+from jitter_buffer import JitterBuffer
+from loop_monitor import LoopLagMonitor, sample_profile
+from static_assets import StaticAssetCache
+from session import ClientSession
+from streaming_asr import HAS_VOSK, VoskStreamingRecognizer
+from audio_codec import decode_audio, negotiate
+from event_store import EventStore
+
 # AI and Speech modules
 try:
     import speech_recognition as sr
@@ -51,6 +67,31 @@ class Config:
     OPENAI_API_KEY = "your_openai_key_here"  # Load from env
     USE_LOCAL_AI = True
     MAX_AUDIO_BUFFER = 16000 * 5  # 5 seconds at 16kHz
+    JITTER_WINDOW = 4  # frames held back for reordering
+    AUDIO_CONCEALMENT = "interpolate"  # or "silence"
+    ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")  # empty disables /admin endpoints
+    LOOP_LAG_INTERVAL = 0.25  # seconds between event loop lag samples
+    SLOW_CALLBACK_THRESHOLD = 0.1  # seconds the loop may block before we grab a stack
+    MAX_PROFILE_SECONDS = 30
+    HEARTBEAT_INTERVAL = 15  # seconds between server pings
+    HEARTBEAT_TIMEOUT = 45  # no frame at all for this long = half-open socket
+    IDLE_TIMEOUT = 30 * 60  # no input from a device for this long = idle (viewers exempt)
+    CLOSE_TIMEOUT = 2
+    MAX_TRACKED_DEVICES = 256  # audio stats kept for recently seen devices
+    STREAMING_ASR = True  # decode while the user talks when a streaming recognizer exists
+    VOSK_MODEL_PATH = os.getenv("VOSK_MODEL_PATH", "")
+    END_OF_SPEECH_MS = 600  # trailing silence that ends an utterance
+    PRE_ROLL_MS = 300  # leading silence kept before the first speech frame
+    SILENCE_RMS = 500  # int16 RMS below which a frame counts as silence
+    FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "frontend")
+    EVENT_STORE_DIR = os.getenv("EVENT_STORE_DIR",
+                                os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "events"))
+    EVENT_SEGMENT_ROWS = 1 << 16  # events per memory-mapped segment
+    EVENT_BATCH_SIZE = 256  # pending events per client before a flush
+    EVENT_FLUSH_INTERVAL = 1.0  # seconds between background flushes
+    EVENT_MAX_CLIENTS = 256  # client histories kept in memory (others re-read from disk)
+    EVENT_MAX_MAPPED_SEGMENTS = 64  # memory-mapped segments, 6 fds each
+    RECENT_CONTEXT_EVENTS = 5  # history passed to the AI as context
     
 # Gesture to intent mapping
 GESTURE_INTENTS = {
@@ -66,45 +107,145 @@ GESTURE_INTENTS = {
 # Initialize FastAPI
 app = FastAPI()
 
-# Mount static files
+# Static frontend, precompressed and held in memory
+static_assets = StaticAssetCache(Config.FRONTEND_DIR)
 try:
-    app.mount("/static", StaticFiles(directory="frontend"), name="static")
-except Exception as e:
-    logger.warning(f"Could not mount static files: {e}")
+    static_assets.load()
+except OSError as e:
+    logger.warning(f"Could not load static files: {e}")
+
+# Binary audio_chunk frame: type, utterance id, sequence, flags (bit 0 = last)
+AUDIO_CHUNK_FRAME = 1
+AUDIO_CHUNK_HEADER = struct.Struct("<BIHB")
+utterance_ids = count(1)
 
 # Connection manager for WebSocket
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: Dict[str, WebSocket] = {}
+        self.active_connections: Dict[str, ClientSession] = {}
+        self._heartbeat_task: Optional[asyncio.Task] = None
     
-    async def connect(self, client_id: str, websocket: WebSocket):
+    async def connect(self, client_id: str, websocket: WebSocket) -> ClientSession:
         await websocket.accept()
-        self.active_connections[client_id] = websocket
+        previous = self.active_connections.get(client_id)
+        if previous is not None:
+            # Same device reconnected before we noticed the old socket died
+            await self.evict(previous, "replaced by new connection")
+        session = ClientSession(client_id, websocket)
+        self.active_connections[client_id] = session
         logger.info(f"Client {client_id} connected")
+        return session
+    
+    def disconnect(self, session: ClientSession):
+        """Forget a session; safe to call more than once"""
+        if self.active_connections.get(session.client_id) is session:
+            del self.active_connections[session.client_id]
+            logger.info(f"Client {session.client_id} disconnected")
+        session.audio_buffer = bytearray()
+        session.asr_stream = None
     
-    def disconnect(self, client_id: str):
-        del self.active_connections[client_id]
-        logger.info(f"Client {client_id} disconnected")
+    async def evict(self, session: ClientSession, reason: str):
+        logger.warning(f"Evicting client {session.client_id}: {reason}")
+        self.disconnect(session)
+        try:
+            await asyncio.wait_for(session.websocket.close(code=1001), timeout=Config.CLOSE_TIMEOUT)
+        except Exception:
+            pass
     
     async def send_to_client(self, client_id: str, data: dict):
-        if client_id in self.active_connections:
-            await self.active_connections[client_id].send_json(data)
+        session = self.active_connections.get(client_id)
+        if session is not None:
+            await self._send(session, data)
     
     async def broadcast(self, data: dict):
-        for connection in self.active_connections.values():
-            try:
-                await connection.send_json(data)
-            except Exception as e:
-                logger.error(f"Error broadcasting: {e}")
+        for session in list(self.active_connections.values()):
+            await self._send(session, data)
+    
+    async def _send(self, session: ClientSession, data: dict):
+        try:
+            await session.websocket.send_json(data)
+            session.messages_out += 1
+        except Exception as e:
+            logger.error(f"Error sending to {session.client_id}: {e}")
+            await self.evict(session, "send failed")
+    
+    def wants_audio(self) -> bool:
+        """Whether any client subscribed to spoken replies in its handshake"""
+        return any(s.audio_chunks for s in self.active_connections.values())
+    
+    async def broadcast_audio_chunk(self, utterance_id: int, seq: int, last: bool, audio: bytes):
+        """Send one TTS clip to clients that asked for it, binary or JSON"""
+        header = AUDIO_CHUNK_HEADER.pack(AUDIO_CHUNK_FRAME, utterance_id, seq, 1 if last else 0)
+        binary = header + audio
+        json_msg = None
+        for session in list(self.active_connections.values()):
+            if session.audio_chunks == "binary":
+                await self._send_bytes(session, binary)
+            elif session.audio_chunks == "json":
+                if json_msg is None:
+                    json_msg = {
+                        "type": "audio_chunk",
+                        "utterance": utterance_id,
+                        "seq": seq,
+                        "last": last,
+                        "audio": base64.b64encode(audio).decode()
+                    }
+                await self._send(session, json_msg)
+    
+    async def _send_bytes(self, session: ClientSession, data: bytes):
+        try:
+            await session.websocket.send_bytes(data)
+            session.messages_out += 1
+        except Exception as e:
+            logger.error(f"Error sending to {session.client_id}: {e}")
+            await self.evict(session, "send failed")
+    
+    def start_heartbeats(self):
+        if self._heartbeat_task is None:
+            self._heartbeat_task = asyncio.get_running_loop().create_task(self._heartbeat())
+    
+    def stop_heartbeats(self):
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+    
+    async def _heartbeat(self):
+        """Ping every session and evict half-open or idle ones"""
+        while True:
+            await asyncio.sleep(Config.HEARTBEAT_INTERVAL)
+            now = time.monotonic()
+            for session in list(self.active_connections.values()):
+                reason = session.expired(now, Config.HEARTBEAT_TIMEOUT, Config.IDLE_TIMEOUT)
+                if reason:
+                    await self.evict(session, reason)
+                    continue
+                session.pings_sent += 1
+                await self._send(session, {"type": "ping", "seq": session.pings_sent})
 
 manager = ConnectionManager()
 
+# Per-device audio jitter buffers, kept across reconnects for stats
+jitter_buffers: "OrderedDict[str, JitterBuffer]" = OrderedDict()
+
+def get_jitter_buffer(client_id: str) -> JitterBuffer:
+    if client_id in jitter_buffers:
+        jitter_buffers.move_to_end(client_id)
+    else:
+        jitter_buffers[client_id] = JitterBuffer(Config.JITTER_WINDOW, Config.AUDIO_CONCEALMENT)
+        while len(jitter_buffers) > Config.MAX_TRACKED_DEVICES:
+            jitter_buffers.popitem(last=False)
+    return jitter_buffers[client_id]
+
 # AI Backend Interface
 class AIBackend:
     def __init__(self):
         self.openai_client = None
         self.speech_recognizer = None
-        self.tts_engine = None
+        self.streaming_recognizer = None
+        self.tts_engine = None  # created on the TTS thread by _synthesize
+        # pyttsx3 drivers (sapi5/nsss) are bound to the thread that created
+        # the engine: creation and all synthesis run on this one worker thread
+        self.tts_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts")
         self.initialize()
     
     def initialize(self):
@@ -115,9 +256,11 @@ class AIBackend:
         if HAS_SPEECH:
             self.speech_recognizer = sr.Recognizer()
         
-        if HAS_TTS:
-            self.tts_engine = pyttsx3.init()
-            self.tts_engine.setProperty('rate', 150)
+        if Config.STREAMING_ASR and HAS_VOSK and Config.VOSK_MODEL_PATH:
+            try:
+                self.streaming_recognizer = VoskStreamingRecognizer(Config.VOSK_MODEL_PATH)
+            except Exception as e:
+                logger.error(f"Could not load Vosk model: {e}")
     
     async def transcribe_audio(self, audio_data: bytes) -> Optional[str]:
         """Convert audio bytes to text"""
@@ -135,6 +278,32 @@ class AIBackend:
             logger.error(f"Transcription error: {e}")
             return None
     
+    def start_transcription(self):
+        """Open an incremental recognition stream, or None for batch mode"""
+        if self.streaming_recognizer is None:
+            return None
+        return self.streaming_recognizer.start()
+    
+    async def feed_transcription(self, stream, audio_data: bytes) -> Optional[str]:
+        """Decode more audio off the event loop, return the partial transcript"""
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, stream.feed, audio_data)
+        except Exception as e:
+            logger.error(f"Streaming transcription error: {e}")
+            return None
+    
+    async def finish_transcription(self, stream) -> Optional[str]:
+        """Flush the stream and return the final transcript"""
+        try:
+            loop = asyncio.get_running_loop()
+            text = await loop.run_in_executor(None, stream.finish)
+            logger.info(f"Transcribed: {text}")
+            return text
+        except Exception as e:
+            logger.error(f"Streaming transcription error: {e}")
+            return None
+    
     async def generate_response(self, user_input: str, context: dict) -> tuple[str, dict]:
         """Generate AI response using LLM"""
         if not HAS_OPENAI:
@@ -151,6 +320,12 @@ You detect the user's gestures and respond appropriately with emotion and person
             if gesture:
                 system_prompt += f"\nThe user just made a {gesture['gesture']} gesture."
             
+            # Include recent history if available
+            recent_gestures = [e["gesture"] for e in context.get("recent_events", [])
+                               if e["event_type"] == "gesture"]
+            if recent_gestures:
+                system_prompt += f"\nRecent gestures, oldest first: {', '.join(recent_gestures)}."
+            
             # Call OpenAI API
             response = self.openai_client.chat.completions.create(
                 model="gpt-3.5-turbo",
@@ -181,14 +356,48 @@ You detect the user's gestures and respond appropriately with emotion and person
             return b""
         
         try:
-            # This is a placeholder - use actual TTS library
-            # In production, use gTTS or a similar service
             logger.info(f"Generating speech for: {text}")
-            return b"audio_bytes_placeholder"
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.tts_executor, self._synthesize, text)
         except Exception as e:
             logger.error(f"TTS error: {e}")
             return b""
     
+    async def stream_speech(self, text: str) -> AsyncIterator[Tuple[bytes, bool]]:
+        """Yield (clip, is_last) per sentence, synthesizing N+1 while N is sent"""
+        sentences = split_sentences(text)
+        if not HAS_TTS or not sentences:
+            return
+        
+        loop = asyncio.get_running_loop()
+        pending = loop.run_in_executor(self.tts_executor, self._synthesize, sentences[0])
+        for i in range(len(sentences)):
+            try:
+                audio = await pending
+            except Exception as e:
+                logger.error(f"TTS error: {e}")
+                audio = b""
+            if i + 1 < len(sentences):
+                pending = loop.run_in_executor(self.tts_executor, self._synthesize, sentences[i + 1])
+            last = i + 1 == len(sentences)
+            if audio or last:
+                yield audio, last
+    
+    def _synthesize(self, text: str) -> bytes:
+        """Blocking: render text to WAV bytes (runs on the TTS thread)"""
+        if self.tts_engine is None:
+            self.tts_engine = pyttsx3.init()
+            self.tts_engine.setProperty('rate', 150)
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        try:
+            self.tts_engine.save_to_file(text, path)
+            self.tts_engine.runAndWait()
+            with open(path, "rb") as f:
+                return f.read()
+        finally:
+            os.remove(path)
+    
     def _detect_emotion(self, text: str) -> str:
         """Simple emotion detection based on text"""
         text_lower = text.lower()
@@ -210,17 +419,63 @@ You detect the user's gestures and respond appropriately with emotion and person
             return GESTURE_INTENTS.get(gesture.get("gesture"), {}).get("animation", "idle")
         return "nod"
 
+def split_sentences(text: str) -> List[str]:
+    """Split a reply into sentences for incremental synthesis"""
+    return [part for part in re.split(r"(?<=[.!?])\s+", text.strip()) if part]
+
 # Initialize AI backend
 ai_backend = AIBackend()
 
+# Event loop health
+loop_monitor = LoopLagMonitor(Config.LOOP_LAG_INTERVAL, Config.SLOW_CALLBACK_THRESHOLD)
+
+# Per-client event history
+event_store = EventStore(Config.EVENT_STORE_DIR, Config.EVENT_SEGMENT_ROWS,
+                         Config.EVENT_BATCH_SIZE, Config.EVENT_FLUSH_INTERVAL,
+                         Config.EVENT_MAX_CLIENTS, Config.EVENT_MAX_MAPPED_SEGMENTS)
+
+@app.on_event("startup")
+async def start_background_tasks():
+    loop_monitor.start()
+    manager.start_heartbeats()
+    try:
+        event_store.load()
+    except OSError as e:
+        logger.warning(f"Could not load event history: {e}")
+    event_store.start()
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    loop_monitor.stop()
+    manager.stop_heartbeats()
+    event_store.stop()
+
+def require_admin(authorization: Optional[str]):
+    """Check a "Bearer <ADMIN_TOKEN>" header"""
+    if not Config.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints disabled (set ADMIN_TOKEN)")
+    token = (authorization or "").replace("Bearer ", "", 1).strip()
+    if not secrets.compare_digest(token, Config.ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
 # Routes
 @app.get("/")
-async def get_homepage():
+async def get_homepage(accept_encoding: Optional[str] = Header(None),
+                       if_none_match: Optional[str] = Header(None)):
     """Serve the main webpage"""
-    try:
-        return FileResponse("frontend/index.html")
-    except FileNotFoundError:
+    response = static_assets.respond("index.html", accept_encoding, if_none_match)
+    if response is None:
         return HTMLResponse("<h1>Wearable AI Companion</h1><p>Frontend files not found. Please ensure frontend/index.html exists.</p>")
+    return response
+
+@app.get("/static/{path:path}")
+async def get_static(path: str, accept_encoding: Optional[str] = Header(None),
+                     if_none_match: Optional[str] = Header(None)):
+    """Serve a frontend asset from the in-memory cache"""
+    response = static_assets.respond(path, accept_encoding, if_none_match)
+    if response is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    return response
 
 @app.get("/health")
 async def health_check():
@@ -235,30 +490,191 @@ async def health_check():
         }
     }
 
+@app.get("/audio/stats")
+async def audio_stats():
+    """Audio loss / reorder statistics for every device"""
+    return {client_id: jb.snapshot() for client_id, jb in jitter_buffers.items()}
+
+@app.get("/audio/stats/{client_id}")
+async def audio_stats_for_client(client_id: str):
+    """Audio loss / reorder statistics for one device"""
+    jb = jitter_buffers.get(client_id)
+    return jb.snapshot() if jb else {}
+
+@app.get("/sessions")
+async def list_sessions():
+    """Live connections and their liveness counters"""
+    now = time.monotonic()
+    return {
+        client_id: session.snapshot(now)
+        for client_id, session in manager.active_connections.items()
+    }
+
+@app.get("/events")
+async def event_summary(start: Optional[float] = None, end: Optional[float] = None):
+    """Event counts and latency percentiles across all devices (unix-time range)"""
+    summary = event_store.query(None, start, end)
+    summary["store"] = event_store.snapshot()
+    return summary
+
+@app.get("/events/{client_id}")
+async def client_event_summary(client_id: str, start: Optional[float] = None,
+                               end: Optional[float] = None):
+    """Event counts and latency percentiles for one device"""
+    return event_store.query(client_id, start, end)
+
+@app.get("/events/{client_id}/recent")
+async def client_recent_events(client_id: str, limit: int = 20):
+    """Most recent events for one device, oldest first"""
+    return event_store.recent(client_id, min(max(limit, 0), 1000))
+
+@app.get("/admin/loop-lag")
+async def admin_loop_lag(authorization: Optional[str] = Header(None)):
+    """Event loop scheduling delay histogram and recent slow callbacks"""
+    require_admin(authorization)
+    return loop_monitor.snapshot()
+
+@app.get("/admin/profile")
+async def admin_profile(seconds: float = 5.0, authorization: Optional[str] = Header(None)):
+    """Sample the live event loop and return collapsed stacks for flame graphs"""
+    require_admin(authorization)
+    seconds = min(max(seconds, 0.1), Config.MAX_PROFILE_SECONDS)
+    loop = asyncio.get_running_loop()
+    collapsed = await loop.run_in_executor(None, sample_profile, loop_monitor.loop_thread_id, seconds)
+    return PlainTextResponse(collapsed)
+
+def is_silence(frame: bytes) -> bool:
+    """Cheap energy VAD on one 16-bit PCM frame"""
+    samples = np.frombuffer(frame[:len(frame) - len(frame) % 2], dtype="<i2")
+    if samples.size == 0:
+        return True
+    return float(np.sqrt(np.mean(samples.astype(np.float32) ** 2))) < Config.SILENCE_RMS
+
+async def release_held_audio(session: ClientSession):
+    """Move frames the jitter buffer still holds behind a gap into the utterance"""
+    if session.jitter_buffer is None:
+        return
+    frames = session.jitter_buffer.flush()
+    if not any(frames):
+        return
+    if not all(is_silence(frame) for frame in frames):
+        session.heard_speech = True
+    held = b"".join(frames)
+    session.audio_buffer.extend(held)
+    if session.asr_stream is not None:
+        await ai_backend.feed_transcription(session.asr_stream, held)
+
+async def finish_utterance(session: ClientSession):
+    """Turn the buffered utterance into a transcript and a voice response"""
+    await release_held_audio(session)
+    heard_speech = session.heard_speech
+    stream = session.asr_stream
+    session.asr_stream = None
+    session.last_partial = None
+    session.silence_bytes = 0
+    session.heard_speech = False
+    
+    # Nothing but silence (e.g. audio_end from an idle device): don't transcribe
+    if not heard_speech:
+        session.audio_buffer.clear()
+        return
+    
+    end_of_speech = time.perf_counter()
+    if stream is not None:
+        transcribed_text = await ai_backend.finish_transcription(stream)
+    else:
+        transcribed_text = await ai_backend.transcribe_audio(bytes(session.audio_buffer))
+    session.audio_buffer.clear()
+    asr_latency_ms = (time.perf_counter() - end_of_speech) * 1000
+    
+    if not transcribed_text:
+        return
+    logger.info(f"Final transcript for {session.client_id} after {asr_latency_ms:.0f}ms")
+    
+    # Generate AI response
+    response_text, animation_data = await ai_backend.generate_response(
+        transcribed_text,
+        {"recent_events": event_store.recent(session.client_id, Config.RECENT_CONTEXT_EVENTS)}
+    )
+    
+    # Text goes out immediately; speech follows sentence by sentence
+    utterance_id = next(utterance_ids)
+    response_msg = {
+        "type": "voice_response",
+        "transcribed": transcribed_text,
+        "response": response_text,
+        "emotion": animation_data["emotion"],
+        "animation": animation_data["animation"],
+        "audio": "",
+        "utterance": utterance_id,
+        "asr_latency_ms": round(asr_latency_ms, 1),
+        "timestamp": datetime.now().isoformat()
+    }
+    await manager.broadcast(response_msg)
+    event_store.record(session.client_id, "voice", emotion=animation_data["emotion"],
+                       latency_ms=(time.perf_counter() - end_of_speech) * 1000)
+    await stream_reply_audio(utterance_id, response_text)
+
+async def stream_reply_audio(utterance_id: int, text: str):
+    """Synthesize per sentence and send ordered audio_chunk frames"""
+    # Wearables never play audio; don't synthesize for nobody
+    if not manager.wants_audio():
+        return
+    started = time.perf_counter()
+    seq = 0
+    async for audio, last in ai_backend.stream_speech(text):
+        if seq == 0:
+            logger.info(f"Time to first audio: {(time.perf_counter() - started) * 1000:.0f}ms")
+        await manager.broadcast_audio_chunk(utterance_id, seq, last, audio)
+        seq += 1
+
 @app.websocket("/ws/{client_id}")
 async def websocket_endpoint(client_id: str, websocket: WebSocket):
     """WebSocket endpoint for M5StickC Plus 2 and web clients"""
-    await manager.connect(client_id, websocket)
-    
-    audio_buffer = bytearray()
+    session = await manager.connect(client_id, websocket)
     
     try:
         while True:
             data = await websocket.receive_text()
-            message = json.loads(data)
+            try:
+                message = json.loads(data)
+                msg_type = message.get("type")
+            except (ValueError, AttributeError):
+                logger.warning(f"Ignoring malformed message from {client_id}")
+                continue
             
-            msg_type = message.get("type")
+            session.touch(msg_type)
             logger.info(f"Received {msg_type} from {client_id}")
             
+            if msg_type == "pong":
+                continue
+            
+            # Answer client-initiated keepalives
+            if msg_type == "ping":
+                await manager.send_to_client(client_id, {"type": "pong", "seq": message.get("seq")})
+            
+            # Client capabilities
+            elif msg_type == "handshake":
+                audio_chunks = message.get("audioChunks")
+                session.audio_chunks = audio_chunks if audio_chunks in ("binary", "json") else None
+                if "audioCodecs" in message:
+                    session.audio_codec = negotiate(message.get("audioCodecs"))
+                    await manager.send_to_client(client_id, {
+                        "type": "handshake_ack",
+                        "audioCodec": session.audio_codec
+                    })
+            
             # Handle gesture data
-            if msg_type == "gesture":
+            elif msg_type == "gesture":
+                received = time.perf_counter()
                 gesture = message.get("gesture")
                 intent_data = GESTURE_INTENTS.get(gesture, {})
                 
                 # Generate AI response
                 response_text, animation_data = await ai_backend.generate_response(
                     f"User made a {gesture} gesture",
-                    {"gesture": message}
+                    {"gesture": message,
+                     "recent_events": event_store.recent(client_id, Config.RECENT_CONTEXT_EVENTS)}
                 )
                 
                 # Send response to all clients
@@ -271,39 +687,70 @@ async def websocket_endpoint(client_id: str, websocket: WebSocket):
                     "timestamp": datetime.now().isoformat()
                 }
                 await manager.broadcast(response_msg)
+                event_store.record(client_id, "gesture", gesture, message.get("intensity"),
+                                   animation_data["emotion"], (time.perf_counter() - received) * 1000)
             
             # Handle audio data
             elif msg_type == "audio":
-                audio_base64 = message.get("data", "")
-                audio_chunk = base64.b64decode(audio_base64)
-                audio_buffer.extend(audio_chunk)
+                # Batched frames carry consecutive sequence numbers from "seq"
+                chunks = message.get("chunks") or [message.get("data", "")]
+                seq = message.get("seq")
+                if seq is not None and (not isinstance(seq, int) or isinstance(seq, bool)):
+                    logger.warning(f"Non-integer audio seq {seq!r} from {client_id}; treating as unsequenced")
+                    seq = None
+                capture_ts = message.get("timestamp")
+                if session.jitter_buffer is None:
+                    session.jitter_buffer = get_jitter_buffer(client_id)
+                    session.jitter_buffer.reset()
+                jitter_buffer = session.jitter_buffer
+                new_audio = bytearray()
+                codec = message.get("codec", session.audio_codec)
+                for i, audio_base64 in enumerate(chunks):
+                    encoded = base64.b64decode(audio_base64)
+                    audio_chunk = decode_audio(codec, encoded)
+                    session.audio_wire_bytes += len(encoded)
+                    session.audio_pcm_bytes += len(audio_chunk)
+                    frame_seq = seq + i if seq is not None else None
+                    for frame in jitter_buffer.push(audio_chunk, frame_seq, capture_ts):
+                        new_audio.extend(frame)
+                        if is_silence(frame):
+                            session.silence_bytes += len(frame)
+                        else:
+                            session.silence_bytes = 0
+                            session.heard_speech = True
+                session.audio_buffer.extend(new_audio)
+                if not session.heard_speech:
+                    # Keep only a short pre-roll of leading silence
+                    excess = len(session.audio_buffer) - Config.PRE_ROLL_MS * 32
+                    if excess > 0:
+                        del session.audio_buffer[:excess]
                 
-                # When buffer reaches sufficient size, transcribe
-                if len(audio_buffer) >= Config.MAX_AUDIO_BUFFER:
-                    transcribed_text = await ai_backend.transcribe_audio(bytes(audio_buffer))
-                    
-                    if transcribed_text:
-                        # Generate AI response
-                        response_text, animation_data = await ai_backend.generate_response(
-                            transcribed_text,
-                            {}
-                        )
-                        
-                        # Generate speech
-                        speech_bytes = await ai_backend.generate_speech(response_text)
-                        
-                        response_msg = {
-                            "type": "voice_response",
-                            "transcribed": transcribed_text,
-                            "response": response_text,
-                            "emotion": animation_data["emotion"],
-                            "animation": animation_data["animation"],
-                            "audio": base64.b64encode(speech_bytes).decode() if speech_bytes else "",
-                            "timestamp": datetime.now().isoformat()
-                        }
-                        await manager.broadcast(response_msg)
-                    
-                    audio_buffer.clear()
+                # Decode incrementally while the user is still talking
+                if session.heard_speech and new_audio:
+                    if session.asr_stream is None:
+                        session.asr_stream = ai_backend.start_transcription()
+                    if session.asr_stream is not None:
+                        partial = await ai_backend.feed_transcription(session.asr_stream, bytes(new_audio))
+                        if partial and partial != session.last_partial:
+                            session.last_partial = partial
+                            await manager.broadcast({
+                                "type": "partial_transcript",
+                                "client_id": client_id,
+                                "text": partial,
+                                "timestamp": datetime.now().isoformat()
+                            })
+                
+                # Utterance ends on trailing silence or a full buffer
+                end_of_speech = (session.heard_speech and
+                                 session.silence_bytes >= Config.END_OF_SPEECH_MS * 32)
+                if end_of_speech or len(session.audio_buffer) >= Config.MAX_AUDIO_BUFFER:
+                    await finish_utterance(session)
+            
+            # Device signalled the end of an utterance explicitly
+            elif msg_type == "audio_end":
+                await release_held_audio(session)
+                if session.audio_buffer:
+                    await finish_utterance(session)
             
             # Handle button presses
             elif msg_type == "button":
@@ -324,10 +771,14 @@ async def websocket_endpoint(client_id: str, websocket: WebSocket):
                     "emotion": "happy"
                 }
                 await manager.broadcast(response_msg)
+                event_store.record(client_id, "button", emotion="happy")
     
     except WebSocketDisconnect:
-        manager.disconnect(client_id)
-        logger.info(f"Client {client_id} disconnected")
+        pass
+    except Exception as e:
+        logger.error(f"Connection error for {client_id}: {e}")
+    finally:
+        manager.disconnect(session)
 
 if __name__ == "__main__":
     logger.info("Starting Wearable AI Companion Backend Server...")
@@ -0,0 +1,97 @@
+"""
+Wearable AI Companion - Client Sessions
+Handles:
+- Compact per-connection state (buffers, counters, last-seen)
+- Liveness bookkeeping for ping/pong heartbeats and idle eviction
+"""
+
+import time
+from typing import Optional
+
+from fastapi import WebSocket
+
+# Messages that only input devices send; viewers just handshake and pong
+DEVICE_MESSAGES = ("gesture", "audio", "audio_end", "button")
+
+
+class ClientSession:
+    """State for one WebSocket connection; slotted to keep it small"""
+
+    __slots__ = (
+        "client_id",
+        "websocket",
+        "audio_buffer",
+        "jitter_buffer",
+        "asr_stream",
+        "last_partial",
+        "silence_bytes",
+        "heard_speech",
+        "audio_chunks",
+        "audio_codec",
+        "audio_wire_bytes",
+        "audio_pcm_bytes",
+        "connected_at",
+        "last_seen",
+        "last_active",
+        "is_device",
+        "messages_in",
+        "messages_out",
+        "pings_sent",
+    )
+
+    def __init__(self, client_id: str, websocket: WebSocket):
+        now = time.monotonic()
+        self.client_id = client_id
+        self.websocket = websocket
+        self.audio_buffer = bytearray()
+        self.jitter_buffer = None
+        self.asr_stream = None        # incremental recognizer for the current utterance
+        self.last_partial = None
+        self.silence_bytes = 0        # trailing silence, for end-of-speech detection
+        self.heard_speech = False
+        self.audio_chunks = None      # "binary" / "json" if the client asked for spoken replies
+        self.audio_codec = "pcm16"    # uplink encoding agreed in the handshake
+        self.audio_wire_bytes = 0     # encoded audio received (before base64)
+        self.audio_pcm_bytes = 0      # PCM after decoding
+        self.connected_at = now
+        self.last_seen = now      # any frame, including pongs
+        self.last_active = now    # application messages only
+        self.is_device = False    # has sent sensor/audio input (viewers never do)
+        self.messages_in = 0
+        self.messages_out = 0
+        self.pings_sent = 0
+
+    def touch(self, msg_type: Optional[str]):
+        """Record an inbound message"""
+        now = time.monotonic()
+        self.last_seen = now
+        self.messages_in += 1
+        if msg_type not in ("pong", "ping"):
+            self.last_active = now
+        if msg_type in DEVICE_MESSAGES:
+            self.is_device = True
+
+    def expired(self, now: float, heartbeat_timeout: float, idle_timeout: float) -> Optional[str]:
+        """Reason this session should be evicted, or None"""
+        if now - self.last_seen > heartbeat_timeout:
+            return "heartbeat timeout"
+        # A viewer answering pings is alive, not idle; only devices go idle
+        if self.is_device and now - self.last_active > idle_timeout:
+            return "idle"
+        return None
+
+    def snapshot(self, now: float) -> dict:
+        return {
+            "connected_for": round(now - self.connected_at, 1),
+            "is_device": self.is_device,
+            "idle_for": round(now - self.last_active, 1),
+            "last_seen_ago": round(now - self.last_seen, 1),
+            "messages_in": self.messages_in,
+            "messages_out": self.messages_out,
+            "buffered_audio_bytes": len(self.audio_buffer),
+            "audio_codec": self.audio_codec,
+            "audio_compression": (
+                round(self.audio_wire_bytes / self.audio_pcm_bytes, 3)
+                if self.audio_pcm_bytes else None
+            ),
+        }
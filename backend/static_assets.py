@@ -0,0 +1,148 @@
+"""
+Wearable AI Companion - Static Asset Cache
+Handles:
+- Loading the frontend into memory once at startup
+- Precompressing assets (gzip, and brotli when available)
+- Content-hash ETags, 304 revalidation and immutable fingerprinted URLs
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from typing import Dict, Optional
+import logging
+
+from fastapi import Response
+
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+
+
+class StaticAsset:
+    """One file held in memory with its precompressed variants"""
+
+    def __init__(self, path: str, body: bytes):
+        self.path = path
+        self.content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if self.content_type.startswith("text/") or self.content_type.endswith("javascript"):
+            self.content_type += "; charset=utf-8"
+        self.digest = hashlib.sha256(body).hexdigest()[:16]
+        self.variants: Dict[str, bytes] = {"identity": body}
+
+        if self.content_type.startswith(COMPRESSIBLE_TYPES):
+            gz = gzip.compress(body, compresslevel=9, mtime=0)
+            if len(gz) < len(body):
+                self.variants["gzip"] = gz
+            if HAS_BROTLI:
+                br = brotli.compress(body, quality=11)
+                if len(br) < len(body):
+                    self.variants["br"] = br
+
+    @property
+    def fingerprinted_path(self) -> str:
+        root, ext = os.path.splitext(self.path)
+        return f"{root}.{self.digest[:8]}{ext}"
+
+    def etag(self, encoding: str) -> str:
+        return f'"{self.digest}-{encoding}"'
+
+
+def choose_encoding(accept_encoding: Optional[str], available) -> str:
+    """Pick the best precompressed variant the client accepts"""
+    accepted = set()
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) == 0:
+                    continue
+            except ValueError:
+                pass
+        accepted.add(name.strip().lower())
+    for encoding in ("br", "gzip"):
+        if encoding in available and (encoding in accepted or "*" in accepted):
+            return encoding
+    return "identity"
+
+
+class StaticAssetCache:
+    """In-memory, precompressed view of the frontend directory"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.assets: Dict[str, StaticAsset] = {}
+        self.fingerprinted: Dict[str, StaticAsset] = {}
+
+    def load(self):
+        """Read and compress every file under root (call once at startup)"""
+        self.assets.clear()
+        self.fingerprinted.clear()
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                full_path = os.path.join(dirpath, filename)
+                rel_path = os.path.relpath(full_path, self.root).replace(os.sep, "/")
+                with open(full_path, "rb") as f:
+                    asset = StaticAsset(rel_path, f.read())
+                self.assets[rel_path] = asset
+                if rel_path != "index.html":
+                    self.fingerprinted[asset.fingerprinted_path] = asset
+
+        # Point index.html at fingerprinted URLs so they can be cached forever
+        index = self.assets.get("index.html")
+        if index:
+            html = index.variants["identity"].decode("utf-8")
+            html = re.sub(r'(src|href)="([^":]+)"', self._rewrite_ref, html)
+            self.assets["index.html"] = StaticAsset("index.html", html.encode("utf-8"))
+
+        total = sum(len(a.variants["identity"]) for a in self.assets.values())
+        logger.info(f"Loaded {len(self.assets)} static assets ({total} bytes, brotli={HAS_BROTLI})")
+
+    def _rewrite_ref(self, match) -> str:
+        attr, ref = match.group(1), match.group(2)
+        asset = self.assets.get(ref.lstrip("/"))
+        if asset is None:
+            return match.group(0)
+        return f'{attr}="/static/{asset.fingerprinted_path}"'
+
+    def lookup(self, path: str):
+        """Return (asset, is_fingerprinted) for a request path"""
+        path = path.lstrip("/")
+        if path in self.fingerprinted:
+            return self.fingerprinted[path], True
+        return self.assets.get(path), False
+
+    def respond(self, path: str, accept_encoding: Optional[str],
+                if_none_match: Optional[str]) -> Optional[Response]:
+        """Build the response for path, or None if it is not cached"""
+        asset, immutable = self.lookup(path)
+        if asset is None:
+            return None
+
+        encoding = choose_encoding(accept_encoding, asset.variants)
+        etag = asset.etag(encoding)
+        headers = {
+            "ETag": etag,
+            "Cache-Control": IMMUTABLE_CACHE if immutable else REVALIDATE_CACHE,
+            "Vary": "Accept-Encoding",
+        }
+
+        if if_none_match:
+            candidates = [tag.strip().replace("W/", "", 1) for tag in if_none_match.split(",")]
+            if "*" in candidates or etag in candidates:
+                return Response(status_code=304, headers=headers)
+
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(asset.variants[encoding], media_type=asset.content_type, headers=headers)
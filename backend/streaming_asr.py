@@ -0,0 +1,95 @@
+"""
+Wearable AI Companion - Streaming Speech Recognition
+Handles:
+- Incremental recognition: audio is decoded while the user is talking
+- Partial transcripts as words are recognized
+- A local Vosk recognizer and a deterministic stub for tests/benchmarks
+"""
+
+import json
+import time
+from typing import List, Optional
+
+try:
+    import vosk
+    HAS_VOSK = True
+except ImportError:
+    HAS_VOSK = False
+
+BYTES_PER_SECOND = 16000 * 2  # 16 kHz, 16-bit mono
+
+
+class VoskStream:
+    """One utterance being decoded by Kaldi"""
+
+    def __init__(self, recognizer):
+        self.recognizer = recognizer
+        self.committed: List[str] = []
+
+    def feed(self, audio: bytes) -> Optional[str]:
+        """Decode more audio, return the transcript so far"""
+        if self.recognizer.AcceptWaveform(audio):
+            text = json.loads(self.recognizer.Result()).get("text", "")
+            if text:
+                self.committed.append(text)
+        partial = json.loads(self.recognizer.PartialResult()).get("partial", "")
+        return " ".join(self.committed + [partial]).strip() or None
+
+    def finish(self) -> Optional[str]:
+        """Flush the decoder and return the final transcript"""
+        text = json.loads(self.recognizer.FinalResult()).get("text", "")
+        return " ".join(self.committed + [text]).strip() or None
+
+
+class VoskStreamingRecognizer:
+    """Offline streaming recognizer backed by a Vosk model directory"""
+
+    def __init__(self, model_path: str, sample_rate: int = 16000):
+        self.model = vosk.Model(model_path)
+        self.sample_rate = sample_rate
+
+    def start(self) -> VoskStream:
+        return VoskStream(vosk.KaldiRecognizer(self.model, self.sample_rate))
+
+
+class StubStream:
+    """Reveals a scripted transcript word by word as audio arrives"""
+
+    def __init__(self, owner: "StubStreamingRecognizer"):
+        self.owner = owner
+        self.received = 0
+
+    def feed(self, audio: bytes) -> Optional[str]:
+        self.received += len(audio)
+        self.owner.decode(len(audio))
+        return self._text() or None
+
+    def finish(self) -> Optional[str]:
+        time.sleep(self.owner.finalize_cost)
+        return " ".join(self.owner.words) or None
+
+    def _text(self) -> str:
+        count = self.received // self.owner.bytes_per_word
+        return " ".join(self.owner.words[:count])
+
+
+class StubStreamingRecognizer:
+    """Deterministic local recognizer for tests and benchmarks.
+
+    decode_cost is the simulated compute in seconds per second of audio,
+    finalize_cost the fixed cost of flushing the decoder.
+    """
+
+    def __init__(self, transcript: str = "hello there how are you today",
+                 bytes_per_word: int = BYTES_PER_SECOND // 2,
+                 decode_cost: float = 0.0, finalize_cost: float = 0.0):
+        self.words = transcript.split()
+        self.bytes_per_word = bytes_per_word
+        self.decode_cost = decode_cost
+        self.finalize_cost = finalize_cost
+
+    def decode(self, num_bytes: int):
+        time.sleep(self.decode_cost * num_bytes / BYTES_PER_SECOND)
+
+    def start(self) -> StubStream:
+        return StubStream(self)
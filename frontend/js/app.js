@@ -10,6 +10,11 @@ class AICompanionApp {
         this.reconnectAttempts = 0;
         this.maxReconnectAttempts = 5;
         
+        // Gapless playback of streamed TTS sentences
+        this.audioContext = null;
+        this.nextAudioStart = 0;
+        this.audioChain = Promise.resolve();
+        
         this.emotionIcons = {
             happy: '😊',
             sad: '😢',
@@ -54,9 +59,16 @@ class AICompanionApp {
         console.log(`Connecting to ${wsUrl}`);
         
         this.ws = new WebSocket(wsUrl);
+        this.ws.binaryType = 'arraybuffer';
         
         this.ws.onopen = () => this.handleOpen();
-        this.ws.onmessage = (event) => this.handleMessage(event.data);
+        this.ws.onmessage = (event) => {
+            if(event.data instanceof ArrayBuffer) {
+                this.handleBinaryMessage(event.data);
+            } else {
+                this.handleMessage(event.data);
+            }
+        };
         this.ws.onerror = (error) => this.handleError(error);
         this.ws.onclose = () => this.handleClose();
     }
@@ -71,6 +83,7 @@ class AICompanionApp {
             type: 'handshake',
             clientId: this.clientId,
             userAgent: navigator.userAgent,
+            audioChunks: 'binary',
             timestamp: new Date().toISOString()
         });
     }
@@ -81,6 +94,11 @@ class AICompanionApp {
             console.log('Received:', message);
             
             switch(message.type) {
+                case 'ping':
+                    // Server heartbeat - reply so this viewer is not evicted
+                    this.send({ type: 'pong', seq: message.seq });
+                    break;
+                
                 case 'gesture':
                     this.handleGestureResponse(message);
                     break;
@@ -89,10 +107,18 @@ class AICompanionApp {
                     this.handleAIResponse(message);
                     break;
                 
+                case 'partial_transcript':
+                    this.handlePartialTranscript(message);
+                    break;
+                
                 case 'voice_response':
                     this.handleVoiceResponse(message);
                     break;
                 
+                case 'audio_chunk':
+                    this.queueAudioChunk(this.base64ToArrayBuffer(message.audio));
+                    break;
+                
                 case 'animation':
                     this.handleAnimationCommand(message);
                     break;
@@ -152,6 +178,12 @@ class AICompanionApp {
         }
     }
     
+    handlePartialTranscript(message) {
+        // Live caption while the user is still talking
+        this.displayText(`You: "${message.text || ''}…"`);
+        this.setEmotion('listening');
+    }
+    
     handleVoiceResponse(message) {
         const transcribed = message.transcribed || '';
         const response = message.response || '';
@@ -174,6 +206,48 @@ class AICompanionApp {
         }
     }
     
+    handleBinaryMessage(buffer) {
+        // Header: uint8 type, uint32 utterance, uint16 seq, uint8 flags (little-endian)
+        const view = new DataView(buffer);
+        if(buffer.byteLength < 8 || view.getUint8(0) !== 1) {
+            console.log('Unknown binary frame');
+            return;
+        }
+        this.queueAudioChunk(buffer.slice(8));
+    }
+    
+    queueAudioChunk(arrayBuffer) {
+        if(arrayBuffer.byteLength === 0) {
+            return;
+        }
+        if(!this.audioContext) {
+            this.audioContext = new (window.AudioContext || window.webkitAudioContext)();
+        }
+        const ctx = this.audioContext;
+        
+        // Chunks arrive in order; decode sequentially so they also play in order
+        this.audioChain = this.audioChain
+            .then(() => ctx.decodeAudioData(arrayBuffer))
+            .then((buffer) => {
+                const source = ctx.createBufferSource();
+                source.buffer = buffer;
+                source.connect(ctx.destination);
+                const startAt = Math.max(ctx.currentTime, this.nextAudioStart);
+                source.start(startAt);
+                this.nextAudioStart = startAt + buffer.duration;
+            })
+            .catch((error) => console.error('Error playing audio chunk:', error));
+    }
+    
+    base64ToArrayBuffer(audioBase64) {
+        const audioData = atob(audioBase64);
+        const view = new Uint8Array(audioData.length);
+        for(let i = 0; i < audioData.length; i++) {
+            view[i] = audioData.charCodeAt(i);
+        }
+        return view.buffer;
+    }
+    
     handleAnimationCommand(message) {
         const animation = message.animation || 'idle';
         this.avatar.playAnimation(animation);
@@ -0,0 +1,124 @@
+#ifndef AUDIO_CODEC_H
+#define AUDIO_CODEC_H
+
+#include <stdint.h>
+#include <string.h>
+
+// Uplink audio encodings, negotiated with the server in the handshake
+enum AudioCodec {
+    CODEC_PCM16 = 0,      // 16 bits/sample, 256 kbit/s at 16kHz
+    CODEC_MULAW = 1,      // G.711 mu-law, 8 bits/sample
+    CODEC_IMA_ADPCM = 2   // IMA-ADPCM, 4 bits/sample + 4 byte frame header
+};
+
+inline const char* audioCodecToString(AudioCodec codec) {
+    switch(codec) {
+        case CODEC_MULAW: return "mulaw";
+        case CODEC_IMA_ADPCM: return "ima_adpcm";
+        default: return "pcm16";
+    }
+}
+
+inline AudioCodec audioCodecFromString(const char* name) {
+    if(name && strcmp(name, "mulaw") == 0) return CODEC_MULAW;
+    if(name && strcmp(name, "ima_adpcm") == 0) return CODEC_IMA_ADPCM;
+    return CODEC_PCM16;
+}
+
+// G.711 mu-law: one byte per sample
+inline uint8_t mulawEncodeSample(int16_t pcm) {
+    const int BIAS = 0x84;
+    const int CLIP = 32635;
+    int sign = (pcm < 0) ? 0x80 : 0;
+    int sample = (pcm < 0) ? -(int)pcm : pcm;
+    if(sample > CLIP) sample = CLIP;
+    sample += BIAS;
+
+    int exponent = 7;
+    for(int mask = 0x4000; (sample & mask) == 0 && exponent > 0; mask >>= 1) {
+        exponent--;
+    }
+    int mantissa = (sample >> (exponent + 3)) & 0x0F;
+    return ~(sign | (exponent << 4) | mantissa);
+}
+
+inline size_t mulawEncode(const int16_t* pcm, size_t samples, uint8_t* out) {
+    for(size_t i = 0; i < samples; i++) {
+        out[i] = mulawEncodeSample(pcm[i]);
+    }
+    return samples;
+}
+
+// IMA-ADPCM: 4 bits/sample. Every frame starts with a 4 byte header
+// (int16 predictor, uint8 step index, uint8 reserved) so frames decode
+// independently and a lost frame does not corrupt the next one.
+class ImaAdpcmEncoder {
+private:
+    int predictor;
+    int index;
+
+    static const int16_t* stepTable() {
+        static const int16_t table[89] = {
+            7, 8, 9, 10, 11, 12, 13, 14, 16, 17, 19, 21, 23, 25, 28, 31, 34, 37, 41, 45,
+            50, 55, 60, 66, 73, 80, 88, 97, 107, 118, 130, 143, 157, 173, 190, 209, 230,
+            253, 279, 307, 337, 371, 408, 449, 494, 544, 598, 658, 724, 796, 876, 963,
+            1060, 1166, 1282, 1411, 1552, 1707, 1878, 2066, 2272, 2499, 2749, 3024, 3327,
+            3660, 4026, 4428, 4871, 5358, 5894, 6484, 7132, 7845, 8630, 9493, 10442,
+            11487, 12635, 13899, 15289, 16818, 18500, 20350, 22385, 24623, 27086, 29794,
+            32767
+        };
+        return table;
+    }
+
+    uint8_t encodeSample(int16_t sample) {
+        static const int8_t indexTable[16] = {-1, -1, -1, -1, 2, 4, 6, 8,
+                                              -1, -1, -1, -1, 2, 4, 6, 8};
+        int step = stepTable()[index];
+        int diff = sample - predictor;
+        uint8_t code = 0;
+        if(diff < 0) {
+            code = 8;
+            diff = -diff;
+        }
+
+        int delta = step >> 3;
+        if(diff >= step) { code |= 4; diff -= step; delta += step; }
+        if(diff >= (step >> 1)) { code |= 2; diff -= step >> 1; delta += step >> 1; }
+        if(diff >= (step >> 2)) { code |= 1; delta += step >> 2; }
+
+        predictor += (code & 8) ? -delta : delta;
+        if(predictor > 32767) predictor = 32767;
+        if(predictor < -32768) predictor = -32768;
+
+        index += indexTable[code];
+        if(index < 0) index = 0;
+        if(index > 88) index = 88;
+        return code;
+    }
+
+public:
+    ImaAdpcmEncoder() : predictor(0), index(0) {}
+
+    void reset() {
+        predictor = 0;
+        index = 0;
+    }
+
+    // out needs 4 + samples/2 bytes; returns bytes written
+    size_t encode(const int16_t* pcm, size_t samples, uint8_t* out) {
+        out[0] = predictor & 0xFF;
+        out[1] = (predictor >> 8) & 0xFF;
+        out[2] = index;
+        out[3] = 0;
+
+        size_t pos = 4;
+        for(size_t i = 0; i + 1 < samples; i += 2) {
+            uint8_t low = encodeSample(pcm[i]);
+            uint8_t high = encodeSample(pcm[i + 1]);
+            out[pos++] = low | (high << 4);
+        }
+        return pos;
+    }
+};
+
+#endif // AUDIO_CODEC_H
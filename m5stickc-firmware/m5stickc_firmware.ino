@@ -10,6 +10,7 @@
 #include <WebSocketsClient.h>
 #include <ArduinoJson.h>
 #include "gesture_detector.h"
+#include "audio_codec.h"
 
 // Configuration
 #define SSID "YOUR_WIFI_SSID"
@@ -31,6 +32,21 @@ const int AUDIO_BUFFER_SIZE = 512;
 uint8_t audioBuffer[AUDIO_BUFFER_SIZE];
 int audioIndex = 0;
 
+// Audio framing: sequence numbers let the server reorder / conceal loss,
+// batching several chunks per message cuts per-message overhead
+const int AUDIO_BATCH_FRAMES = 2;
+String audioBatch[AUDIO_BATCH_FRAMES];
+int audioBatchCount = 0;
+uint32_t audioSeq = 0;          // sequence number of the next chunk
+uint32_t audioBatchSeq = 0;     // sequence number of the first chunk in batch
+unsigned long audioBatchStart = 0;  // capture time of the first chunk in batch
+
+// Uplink compression: PCM until the server acknowledges a codec
+AudioCodec audioCodec = CODEC_PCM16;
+AudioCodec audioBatchCodec = CODEC_PCM16;  // codec of every chunk in the batch
+ImaAdpcmEncoder adpcmEncoder;
+uint8_t encodedAudio[AUDIO_BUFFER_SIZE];
+
 // Status variables
 bool isConnected = false;
 unsigned long lastSensorRead = 0;
@@ -43,6 +59,13 @@ void webSocketEvent(WStype_t type, uint8_t *payload, size_t length) {
     switch(type) {
         case WStype_CONNECTED:
             isConnected = true;
+            audioSeq = 0;
+            audioBatchCount = 0;
+            audioCodec = CODEC_PCM16;
+            adpcmEncoder.reset();
+            // Offer compressed uplink encodings, best first
+            webSocket.sendTXT("{\"type\": \"handshake\", \"clientId\": \"m5stick\", "
+                              "\"audioCodecs\": [\"ima_adpcm\", \"mulaw\", \"pcm16\"]}");
             M5.Lcd.setTextColor(GREEN);
             M5.Lcd.println("Connected!");
             break;
@@ -51,8 +74,22 @@ void webSocketEvent(WStype_t type, uint8_t *payload, size_t length) {
             DynamicJsonDocument doc(256);
             deserializeJson(doc, payload);
             
+            // Answer server heartbeats so we are not evicted as half-open
+            const char* msgType = doc["type"];
+            if(msgType && strcmp(msgType, "ping") == 0) {
+                String pong = "{\"type\": \"pong\", \"seq\": " + String((long)doc["seq"]) + "}";
+                webSocket.sendTXT(pong);
+                break;
+            }
+            
+            if(msgType && strcmp(msgType, "handshake_ack") == 0) {
+                audioCodec = audioCodecFromString(doc["audioCodec"]);
+                M5.Lcd.printf("Audio: %s\n", audioCodecToString(audioCodec));
+                break;
+            }
+            
             const char* command = doc["command"];
-            if(strcmp(command, "led") == 0) {
+            if(command && strcmp(command, "led") == 0) {
                 int brightness = doc["value"];
                 M5.Axp.SetLcdVoltage(brightness);
             }
@@ -116,16 +153,47 @@ void captureAudio() {
     // This is a placeholder - implement with proper I2S driver
     
     if(isConnected && audioIndex >= AUDIO_BUFFER_SIZE) {
-        DynamicJsonDocument doc(1024);
-        doc["type"] = "audio";
-        doc["data"] = base64::encode(audioBuffer, AUDIO_BUFFER_SIZE);
-        doc["timestamp"] = millis();
-        
-        String jsonStr;
-        serializeJson(doc, jsonStr);
-        webSocket.sendTXT(jsonStr);
-        
+        if(audioBatchCount == 0) {
+            audioBatchSeq = audioSeq;
+            audioBatchStart = millis();
+            // A handshake_ack mid-batch takes effect from the next batch
+            audioBatchCodec = audioCodec;
+        }
+        const int16_t* samples = (const int16_t*)audioBuffer;
+        size_t sampleCount = AUDIO_BUFFER_SIZE / 2;
+        size_t encodedSize;
+        switch(audioBatchCodec) {
+            case CODEC_MULAW:
+                encodedSize = mulawEncode(samples, sampleCount, encodedAudio);
+                break;
+            case CODEC_IMA_ADPCM:
+                encodedSize = adpcmEncoder.encode(samples, sampleCount, encodedAudio);
+                break;
+            default:
+                memcpy(encodedAudio, audioBuffer, AUDIO_BUFFER_SIZE);
+                encodedSize = AUDIO_BUFFER_SIZE;
+        }
+        audioBatch[audioBatchCount++] = base64::encode(encodedAudio, encodedSize);
+        audioSeq++;
         audioIndex = 0;
+        
+        if(audioBatchCount >= AUDIO_BATCH_FRAMES) {
+            DynamicJsonDocument doc(1024 * AUDIO_BATCH_FRAMES);
+            doc["type"] = "audio";
+            doc["seq"] = audioBatchSeq;
+            doc["codec"] = audioCodecToString(audioBatchCodec);
+            doc["timestamp"] = audioBatchStart;
+            JsonArray chunks = doc.createNestedArray("chunks");
+            for(int i = 0; i < audioBatchCount; i++) {
+                chunks.add(audioBatch[i]);
+            }
+            
+            String jsonStr;
+            serializeJson(doc, jsonStr);
+            webSocket.sendTXT(jsonStr);
+            
+            audioBatchCount = 0;
+        }
     }
 }
 